@@ -0,0 +1,477 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import datetime
+import contextlib
+import subprocess
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import dtaidistance
+
+import model
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULT_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+# (nama kasus, jumlah series, panjang series mingguan, panjang series harian)
+# Profil quick melewati series harian sintetis yang paling lama.
+PROFILES = {
+    "quick": [("sintetis-100", 100, 262, None)],
+    "full": [
+        ("sintetis-100", 100, 262, 1305),
+        ("sintetis-1000", 1000, 262, 1305),
+    ],
+}
+
+
+# ===================== DATA =========================
+
+
+def synthetic_daily(n_series, n_days, seed=0):
+    """
+    Data harga harian sintetis (random walk positif) pada hari kerja mulai
+    1 Januari 2020, dengan format yang sama seperti load_data.
+    """
+    rng = np.random.default_rng(seed)
+    tanggal = pd.bdate_range("2020-01-01", periods=n_days)
+    langkah = rng.normal(0, 0.02, size=(n_days, n_series))
+    harga = 10000 * np.exp(np.cumsum(langkah, axis=0))
+    kolom = [f"Series {i + 1}" for i in range(n_series)]
+    data = pd.DataFrame(np.round(harga), columns=kolom)
+    data.insert(0, "Tanggal", tanggal)
+    return data, kolom
+
+
+def synthetic_series(n_series, panjang, seed=0):
+    """Series ternormalisasi sintetis (n_series x panjang) untuk FCM"""
+    rng = np.random.default_rng(seed)
+    series = np.cumsum(rng.normal(size=(n_series, panjang)), axis=1)
+    series = (series - series.mean(axis=1, keepdims=True)) / series.std(
+        axis=1, keepdims=True
+    )
+    return series
+
+
+# ===================== PENGUKURAN =========================
+
+
+def measure(func, repeat=3):
+    """
+    Mengukur waktu (detik), puncak memori Python/NumPy (MB, tracemalloc), dan
+    jumlah perhitungan DTW. Bila func mengembalikan DistanceCache (atau dict
+    info dengan "n_dtw"), jumlah DTW dibaca dari nilai tersebut.
+    Memori internal kernel C dtaidistance tidak ikut terukur.
+    """
+    waktu = []
+    peak = 0
+    dtw_calls = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        cache = func()
+        waktu.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        if isinstance(cache, model.DistanceCache):
+            dtw_calls = cache.n_dtw
+        elif isinstance(cache, dict):
+            dtw_calls = cache["n_dtw"]
+        else:
+            dtw_calls = 0
+    return {
+        "seconds": float(np.mean(waktu)),
+        "seconds_min": float(np.min(waktu)),
+        "repeat": repeat,
+        "dtw_calls": int(dtw_calls),
+        "peak_mb": peak / 1024**2,
+    }
+
+
+@contextlib.contextmanager
+def count_dtw():
+    """
+    Menghitung pasangan DTW yang dihitung backend C selama blok berjalan
+    dengan membungkus dtw.distance_matrix_fast, untuk fungsi yang tidak
+    memakai DistanceCache. Hasilnya dict {"n_dtw": ...} untuk measure.
+    """
+    hitung = {"n_dtw": 0}
+    asli = model.dtw.distance_matrix_fast
+
+    def distance_matrix_fast(series, *args, block=None, **kwargs):
+        if block is None:
+            hitung["n_dtw"] += len(series) * (len(series) - 1) // 2
+        else:
+            (r0, r1), (c0, c1) = block
+            hitung["n_dtw"] += (r1 - r0) * (c1 - c0)
+        return asli(series, *args, block=block, **kwargs)
+
+    model.dtw.distance_matrix_fast = distance_matrix_fast
+    try:
+        yield hitung
+    finally:
+        model.dtw.distance_matrix_fast = asli
+
+
+def bench_case(case, data_harian, kolom, data_fcm, repeat, c=3, m=1.5, maxiter=30):
+    """Menjalankan semua benchmark untuk satu ukuran data"""
+    hasil = []
+    n, t = data_fcm.shape
+
+    def catat(nama, func, **extra):
+        row = {"benchmark": nama, "case": case, "n": n, "t": t}
+        row.update(extra)
+        row.update(measure(func, repeat))
+        hasil.append(row)
+        print(
+            f"{case:>16} {nama:<28} {row['seconds']:9.4f} s "
+            f"{row['dtw_calls']:>9} dtw {row['peak_mb']:9.2f} MB",
+            flush=True,
+        )
+
+    data_mingguan = model.resample_data(data_harian, col=kolom)
+    catat("day_to_week", lambda: model.resample_data(data_harian, col=kolom))
+    catat("z_normalization", lambda: model.z_normalization(data_mingguan, col=kolom))
+
+    u = model.initialize_membership(n, c, random_state=0)
+    centroids = model.compute_centroids(data_fcm, u, m)
+
+    def membership():
+        cache = model.DistanceCache(data_fcm)
+        model.update_membership_dtw(data_fcm, centroids, m, cache=cache)
+        return cache
+
+    def objective():
+        cache = model.DistanceCache(data_fcm)
+        model.compute_objective_function(u, centroids, data_fcm, m, cache=cache)
+        return cache
+
+    def xb():
+        cache = model.DistanceCache(data_fcm)
+        model.compute_xb(data_fcm, centroids, u, m, cache=cache)
+        return cache
+
+    def end_to_end():
+        cache = model.DistanceCache(data_fcm)
+        model.fcm_model(
+            data_fcm,
+            c=c,
+            m=m,
+            error=0.0001,
+            maxiter=maxiter,
+            columns_name=[f"Series {i + 1}" for i in range(n)],
+            cache=cache,
+            random_state=0,
+            progress=False,
+        )
+        return cache
+
+    hasil_sweep = []
+    for k in (2, 3, 4, 5):
+        u_k = model.initialize_membership(n, k, random_state=0)
+        hasil_sweep.append((u_k, model.compute_centroids(data_fcm, u_k, m)))
+
+    def validity_batch():
+        with count_dtw() as hitung:
+            model.evaluate_batch(data_fcm, hasil_sweep, m, indices=list(model.INDEKS))
+        return hitung
+
+    catat("update_membership_dtw", membership, c=c)
+    catat("compute_objective_function", objective, c=c)
+    catat("compute_xb", xb, c=c)
+    catat("evaluate_batch", validity_batch, c="2-5")
+    catat("fcm_model", end_to_end, c=c, maxiter=maxiter)
+
+    def minibatch():
+        _, _, info = model.fcm_minibatch(
+            data_fcm,
+            c=c,
+            m=m,
+            error=0.001,
+            maxiter=maxiter,
+            batch_size=min(256, n),
+            random_state=0,
+            progress=False,
+            return_info=True,
+        )
+        return info
+
+    catat("fcm_minibatch", minibatch, c=c, maxiter=maxiter)
+    return hasil
+
+
+def run(profile="quick", repeat=3, maxiter=30):
+    """
+    Menjalankan benchmark pada data asli (10 komoditas) dan data sintetis
+    sesuai profil; series mingguan dan harian diukur terpisah.
+    """
+    hasil = []
+
+    data = model.load_data()
+    data_fcm = model.prepare_data(data)
+    hasil += bench_case(
+        "asli-mingguan", data, model.komoditas, data_fcm, repeat, maxiter=maxiter
+    )
+    data_fcm = model.prepare_data(data, freq="D")
+    hasil += bench_case(
+        "asli-harian", data, model.komoditas, data_fcm, repeat, maxiter=maxiter
+    )
+
+    for nama, n_series, panjang_mingguan, panjang_harian in PROFILES[profile]:
+        data, kolom = synthetic_daily(n_series, 1305)
+        hasil += bench_case(
+            f"{nama}-mingguan",
+            data,
+            kolom,
+            synthetic_series(n_series, panjang_mingguan),
+            repeat,
+            maxiter=maxiter,
+        )
+        if panjang_harian is None:
+            continue
+        hasil += bench_case(
+            f"{nama}-harian",
+            data,
+            kolom,
+            synthetic_series(n_series, panjang_harian),
+            repeat,
+            maxiter=maxiter,
+        )
+    return hasil
+
+
+# ===================== AKURASI FLOAT32 =========================
+
+
+def dtype_accuracy(c_values=(2, 3, 4, 5), m=1.5, error=0.0001, maxiter=100, freq="W"):
+    """
+    Membandingkan mode ringkas float32 dengan float64 pada data asli: selisih
+    maksimum keanggotaan dan indeks validitas, jumlah iterasi, label klaster,
+    serta memori data, centroid, dan keanggotaan.
+    """
+    data = model.load_data()
+    data_fcm = {
+        dtype: model.prepare_data(data, freq=freq, dtype=dtype)
+        for dtype in (np.float64, np.float32)
+    }
+
+    hasil = []
+    for c in c_values:
+        fit = {}
+        for dtype, data_dtype in data_fcm.items():
+            df_eval, _, info = model.fcm_model(
+                data_dtype,
+                c=c,
+                m=m,
+                error=error,
+                maxiter=maxiter,
+                random_state=0,
+                progress=False,
+                return_info=True,
+            )
+            nbytes = data_dtype.nbytes + info["centroids"].nbytes + info["u"].nbytes
+            fit[dtype] = (df_eval.iloc[0], info, nbytes)
+
+        (eval64, info64, bytes64), (eval32, info32, bytes32) = fit.values()
+        hasil.append(
+            {
+                "Jumlah klaster": c,
+                "Selisih maks u": float(np.max(np.abs(info64["u"] - info32["u"]))),
+                "Selisih MPC": abs(eval64["MPC"] - eval32["MPC"]),
+                "Selisih PE": abs(eval64["PE"] - eval32["PE"]),
+                "Selisih XB": abs(eval64["XB"] - eval32["XB"]),
+                "Iterasi float64": info64["n_iter"],
+                "Iterasi float32": info32["n_iter"],
+                "Label sama": bool(
+                    np.array_equal(
+                        np.argmax(info64["u"], axis=0), np.argmax(info32["u"], axis=0)
+                    )
+                ),
+                "Memori float32 / float64": bytes32 / bytes64,
+            }
+        )
+    return pd.DataFrame(hasil)
+
+
+# ===================== WAKTU IMPORT =========================
+
+# Modul yang waktu import-nya dipantau (dashboard diimpor tanpa menjalankan
+# tampilan, lihat main di dashboard.py)
+IMPORT_TARGETS = ["data_store", "model", "dtw_store", "rendering", "dashboard"]
+
+
+def parse_importtime(stderr):
+    """
+    Mengurai keluaran `python -X importtime`.
+    Output:
+    - list (nama modul, kedalaman, self us, kumulatif us)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():  # baris judul
+            continue
+        name = name.rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative)))
+    return rows
+
+
+def import_time(targets=IMPORT_TARGETS, repeat=5, top=5):
+    """
+    Mengukur waktu cold start import setiap modul pada proses Python baru
+    dengan `-X importtime`. Proses pertama (kompilasi .pyc) tidak dihitung.
+    Output:
+    - hasil: list dict dengan format yang sama seperti bench_case
+    - terberat: dict modul -> DataFrame import langsung terberat
+    """
+    env = dict(os.environ)
+    path = [
+        os.path.dirname(__file__),
+        os.path.join(os.path.dirname(__file__), "dashboard"),
+    ]
+    env["PYTHONPATH"] = os.pathsep.join(path + [env.get("PYTHONPATH", "")])
+
+    hasil = []
+    terberat = {}
+    for target in targets:
+        waktu = []
+        for i in range(repeat + 1):
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            rows = parse_importtime(proc.stderr)
+            if i == 0:
+                continue
+            waktu.append(next(cum for name, _, _, cum in rows if name == target))
+        hasil.append(
+            {
+                "benchmark": "import",
+                "case": target,
+                "seconds": float(np.mean(waktu)) / 1e6,
+                "seconds_min": float(np.min(waktu)) / 1e6,
+                "repeat": repeat,
+                "dtw_calls": 0,
+            }
+        )
+        # Import langsung modul target (kedalaman 1) dari proses terakhir
+        df = pd.DataFrame(
+            rows, columns=["Modul", "Kedalaman", "Self (ms)", "Kumulatif (ms)"]
+        )
+        df[["Self (ms)", "Kumulatif (ms)"]] /= 1000
+        start = df.index[(df["Modul"] == target) & (df["Kedalaman"] == 0)][0]
+        awal = start
+        while awal > 0 and df.loc[awal - 1, "Kedalaman"] > 0:
+            awal -= 1
+        anak = df.loc[awal : start - 1]
+        anak = anak[anak["Kedalaman"] == 1]
+        terberat[target] = anak.nlargest(top, "Kumulatif (ms)").drop(
+            columns="Kedalaman"
+        )
+    return hasil, terberat
+
+
+# ===================== PENYIMPANAN DAN PERBANDINGAN =========================
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(hasil, profile, output_dir=RESULT_DIR):
+    """Menyimpan hasil benchmark beserta metadata versi ke file JSON"""
+    commit = _git_commit()
+    meta = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "profile": profile,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "dtaidistance": dtaidistance.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(output_dir, f"{stamp}-{commit}-{profile}.json")
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": hasil}, f, indent=2)
+    return path
+
+
+def compare(hasil, path_acuan):
+    """
+    Membandingkan hasil dengan file acuan. Rasio > 1 berarti lebih lambat
+    dari acuan.
+    """
+    with open(path_acuan) as f:
+        acuan = pd.DataFrame(json.load(f)["results"])
+    sekarang = pd.DataFrame(hasil)
+
+    kunci = ["benchmark", "case"]
+    df = sekarang.merge(acuan, on=kunci, suffixes=("", "_acuan"))
+    df["rasio_waktu"] = df["seconds_min"] / df["seconds_min_acuan"]
+    df["rasio_dtw"] = df["dtw_calls"] / df["dtw_calls_acuan"].replace(0, np.nan)
+    return df[kunci + ["seconds_min", "seconds_min_acuan", "rasio_waktu", "rasio_dtw"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline FCM-DTW")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--maxiter", type=int, default=30)
+    parser.add_argument("--output", default=RESULT_DIR, help="Folder hasil JSON")
+    parser.add_argument("--compare", default=None, help="File JSON acuan")
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="Hanya ukur waktu cold start import modul (python -X importtime)",
+    )
+    parser.add_argument(
+        "--dtype-accuracy",
+        action="store_true",
+        help="Hanya bandingkan akurasi float32 terhadap float64",
+    )
+    args = parser.parse_args(argv)
+
+    if args.dtype_accuracy:
+        with pd.option_context("display.width", 160):
+            print(dtype_accuracy().to_string(index=False))
+        return
+
+    if args.import_time:
+        profile = "import"
+        hasil, terberat = import_time(repeat=args.repeat)
+        for target, df in terberat.items():
+            row = next(row for row in hasil if row["case"] == target)
+            print(f"{target}: {row['seconds_min'] * 1000:.1f} ms")
+            print(df.to_string(index=False, float_format="{:.1f}".format))
+    else:
+        profile = args.profile
+        hasil = run(profile=args.profile, repeat=args.repeat, maxiter=args.maxiter)
+    path = save_results(hasil, profile, args.output)
+    print(f"Hasil disimpan di {path}")
+
+    if args.compare:
+        with pd.option_context("display.width", 120):
+            print(compare(hasil, args.compare).to_string(index=False))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,30 @@
 import sys, os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from model import transpose_time_series_data, fcm_model, day_to_week, z_normalization
+from model import (
+    transpose_time_series_data,
+    fcm_model,
+    z_normalization,
+    sakoe_chiba_window,
+)
+from data_store import (
+    load_harga_harian,
+    load_mingguan_norm,
+    data_version,
+    FILE_MINGGUAN_NORM,
+)
+from dtw_store import open_store
+from rendering import line_traces, alignment_trace
+from result_cache import ResultCache
+from weekly_index import WeeklyPrefixIndex
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import dash
-import pandas as pd
-import math
 import datetime
 from dtaidistance import dtw
 
-app = dash.Dash(__name__)
-
-st.set_page_config(page_title="Dashboard FCM-DTW", layout="wide")
-
 # ===================   CSS Script   ====================
 
-st.markdown(
-    """
+CSS = """
 <style>
 .big-font{
 font-size:30px !important;
@@ -49,9 +54,7 @@ position: relative;
         font-size: 16px;
     }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
 
 # ===================   LOAD DATA   ====================
 
@@ -70,51 +73,48 @@ pangan = [
 
 
 def load_data():
-    data = pd.read_csv(
-        "https://github.com/ayalya/Harga-Bahan-Pangan/raw/main/Data/csv/HargaBahanPangan2020-2024.csv"
-    )
-    data = data.drop(pangan, axis=1)
-
-    data = data.rename(
-        columns={
-            "Komoditas (Rp)": "Tanggal",
-            "Beras Kualitas Medium I": "Beras",
-            "Bawang Merah Ukuran Sedang": "Bawang Merah",
-            "Bawang Putih Ukuran Sedang": "Bawang Putih",
-            "Cabai Merah Keriting": "Cabai Merah",
-            "Cabai Rawit Merah": "Cabai Rawit",
-            "Daging Sapi Kualitas 1": "Daging Sapi",
-            "Telur Ayam Ras Segar": "Telur Ayam",
-            "Daging Ayam Ras Segar": "Daging Ayam",
-            "Minyak Goreng Kemasan Bermerk 1": "Minyak Goreng",
-            "Gula Pasir Lokal": "Gula Pasir",
-        }
-    )
-    data["Tanggal"] = pd.to_datetime(data["Tanggal"], format="%d/%m/%Y")
-    # data = day_to_week(data)
-    return data
+    return load_harga_harian()
 
 
 def load_data_norm():
-    df = pd.read_csv(
-        "https://github.com/ayalya/Harga-Bahan-Pangan/raw/main/Data/csv/data_mingguan_norm.csv"
-    )
-    df = df.drop(columns=["Tahun", "Unnamed: 0"])
-    return df
+    return load_mingguan_norm()
+
+
+@st.cache_resource
+def get_result_cache():
+    """
+    Cache hasil FCM yang dipakai bersama oleh semua sesi dan rerun Streamlit.
+    Batas memori diatur melalui HARGA_PANGAN_RESULT_CACHE_MB (default 64 MB).
+    """
+    max_mb = float(os.environ.get("HARGA_PANGAN_RESULT_CACHE_MB", 64))
+    return ResultCache(max_bytes=int(max_mb * 1024**2))
+
+
+@st.cache_resource
+def get_weekly_index(versi):
+    """Indeks prefix-sum mingguan, dibangun sekali per versi data"""
+    return WeeklyPrefixIndex(load_data())
 
 
-data = load_data()
-data_norm = load_data_norm()
+@st.cache_resource
+def get_dtw_store(versi):
+    """
+    Store jarak DTW dan best path semua pasangan komoditas (memory-mapped).
+    Dibangun oleh `python dtw_store.py`; bila belum ada untuk versi data ini,
+    dibangun saat pertama kali dibutuhkan.
+    """
+    return open_store(load_data_norm(), versi, names=pangan)
 
 # =================== FUNGSI-FUNGSI    ======================
 # Visualisasi diagram garis menggunakan plotly
 
 
-def diagram_garis_bapok(df):
+def diagram_garis_bapok(data_norm, versi_data):
     """
     Visualisasi semua data menggunakan Plotly
     Parameter:
-    df: DataFrame yang digunakan
+    data_norm: DataFrame mingguan ternormalisasi
+    versi_data: versi data harian untuk indeks mingguan
     output:
     visualisasi data komoditas secara keseluruhan
     """
@@ -125,32 +125,17 @@ def diagram_garis_bapok(df):
     # pilih = st.segmented_control("", opsi, selection_mode='single')
     on = st.toggle("Pakai Data Normalisasi")
 
-    # Reshape data
     if on:  # opsi=='Normalisasi':
         st.write("Data yang ditampilkan adalah data normalisasi")
         df = data_norm
         y_label = "Nilai (Scale)"
-        y = "Nilai"
-        data_log = df.melt(
-            id_vars=["Minggu ke"], value_vars=pangan, var_name="Komoditas", value_name=y
-        )
-        # fig = px.line(data_log, x="Minggu ke", y=y, color='Komoditas')
     else:
         st.write("Data yang ditampilkan adalah harga asli")
-        df = day_to_week(data)
+        df = get_weekly_index(versi_data).weekly()
         y_label = "Harga (Rp)"
-        y = "Harga"
-        data_log = df.melt(
-            id_vars=["Minggu ke"], value_vars=pangan, var_name="Komoditas", value_name=y
-        )
-        # fig = px.line(data_log, x='Minggu ke', y='y', color='Komoditas')
 
-    fig = go.Figure()
-    for komoditas in data_log["Komoditas"].unique():
-        subset = data_log[data_log["Komoditas"] == komoditas]
-        fig.add_trace(
-            go.Scatter(x=subset["Minggu ke"], y=subset[y], mode="lines", name=komoditas)
-        )
+    # Satu trace WebGL per komoditas langsung dari kolom (downsampling LTTB)
+    fig = go.Figure(line_traces(df, "Minggu ke", pangan))
 
     fig.update_yaxes(type="linear")
 
@@ -163,9 +148,12 @@ def diagram_garis_bapok(df):
     st.plotly_chart(fig)
 
 
-def alignment_and_counting_dtw():
+def alignment_and_counting_dtw(data_norm, versi_data_norm):
     """
     Menghitung dan visualisasi jarak antara dua komoditas menggunakan Dynamic Time Warping.
+    Parameter:
+    data_norm: DataFrame mingguan ternormalisasi
+    versi_data_norm: versi data ternormalisasi untuk store DTW
     """
     col1, col2 = st.columns([1, 2])
 
@@ -181,6 +169,15 @@ def alignment_and_counting_dtw():
             "Time-series 2", list(pangan), index=list(pangan).index("Cabai Rawit")
         )
 
+        pita = st.slider(
+            "Pita Sakoe-Chiba (%)",
+            min_value=5,
+            max_value=100,
+            value=100,
+            step=5,
+            help="100% berarti DTW tanpa batasan jendela",
+        )
+
         if names1 == names2:
             st.warning("Data yang dimasukkan sama")
             return
@@ -188,36 +185,40 @@ def alignment_and_counting_dtw():
         s1 = data_norm[names1].values
         s2 = data_norm[names2].values
 
-        distance, path = dtw.warping_paths(s1, s2)
-        best_path = dtw.best_path(path)
+        # Jarak dan path dibaca dari store, tanpa menghitung DTW ulang
+        store = get_dtw_store(versi_data_norm)
+        if store.has(pita):
+            distance = store.distance(names1, names2, pita)
+            best_path = store.best_path(names1, names2, pita)
+        else:
+            window = sakoe_chiba_window(pita, len(s1))
+            distance, path = dtw.warping_paths(s1, s2, window=window)
+            best_path = dtw.best_path(path)
 
         # st.write(f"Jarak = {distance:.4f}")
         m1, m2, m3 = st.columns(3)
         with m2:
             # st.write(f"Jarak = {distance:.4f}")
-            st.metric(label="Jarak", value=distance.round(4))
+            st.metric(label="Jarak", value=round(distance, 4))
 
     # Buat figure Plotly
     fig = go.Figure()
 
     # Tambahkan kedua time-series
-    fig.add_trace(go.Scatter(y=s1, mode="lines", name=names1, line=dict(color="blue")))
     fig.add_trace(
-        go.Scatter(y=s2, mode="lines", name=names2, line=dict(color="orange"))
+        go.Scattergl(y=s1, mode="lines", name=names1, line=dict(color="blue"))
+    )
+    fig.add_trace(
+        go.Scattergl(y=s2, mode="lines", name=names2, line=dict(color="orange"))
     )
 
-    # Tambahkan garis penghubung DTW path
-    for a, b in best_path[:: max(1, len(best_path) // 200)]:
-        # ambil subset supaya tidak terlalu banyak garis
-        fig.add_trace(
-            go.Scatter(
-                x=[a, b],
-                y=[s1[a], s2[b]],
-                mode="lines",
-                line=dict(color="grey", width=1, dash="dot"),
-                showlegend=False,
-            )
+    # Garis penghubung DTW path dalam satu trace; subset supaya tidak terlalu
+    # banyak garis
+    fig.add_trace(
+        alignment_trace(
+            s1, s2, best_path, max_lines=200, color="grey", width=1, dash="dot"
         )
+    )
 
     # Layout
     fig.update_layout(
@@ -242,16 +243,48 @@ def alignment_and_counting_dtw():
         st.plotly_chart(fig, use_container_width=True)
 
 
+def heatmap_jarak_dtw(versi_data_norm):
+    """
+    Heatmap jarak DTW semua pasangan komoditas dari store DTW.
+    """
+    import plotly.express as px
+
+    st.markdown(
+        '<h3 class="subheading">Jarak DTW Antar Komoditas</h3>', unsafe_allow_html=True
+    )
+    store = get_dtw_store(versi_data_norm)
+    pita = st.select_slider(
+        "Pita Sakoe-Chiba heatmap (%)",
+        options=store.pita,
+        value=100,
+        help="100% berarti DTW tanpa batasan jendela",
+    )
+
+    dm = store.distance_matrix(pita)
+    fig = px.imshow(
+        dm.round(4),
+        x=dm.columns,
+        y=dm.index,
+        color_continuous_scale="Blues",
+        text_auto=".2f",
+        aspect="auto",
+    )
+    fig.update_layout(margin=dict(t=20, l=40, r=20, b=40), height=450)
+    st.plotly_chart(fig, use_container_width=True)
+
+
 # ===================   MODEL FCM   ======================
 
-def pilih_jmlh_cluster():
+def pilih_jmlh_cluster(versi_data):
     """
     Memilih parameter dan melatih model
+    Parameter:
+    versi_data: versi data harian, bagian dari kunci cache hasil
     Output:
     df_evaluasi_cluster: DataFrame metrik evaluasi klaster
     df_derajat_keanggotaan: DataFrame derajat keanggotaan
-    df_filtered: data yang sudah difilter tanggal
-    df_filter_norm: data ter-normalisasi (transpose) untuk visualisasi
+    df_week: data mingguan pada rentang tanggal terpilih
+    df_week_norm: data mingguan ter-normalisasi yang dipakai melatih model
     """
 
     st.markdown(
@@ -295,11 +328,11 @@ def pilih_jmlh_cluster():
         st.error("Rentang tanggal harus lebih dari 3 minggu (21 hari)")
         st.stop()
 
-    # Pastikan 'data' sudah ada di global
-    df_filtered = data.loc[
-        (data["Tanggal"] >= pd.to_datetime(start_date)) &
-        (data["Tanggal"] <= pd.to_datetime(end_date))
-    ]
+    # Data mingguan rentang terpilih dari indeks prefix-sum; minggu awal yang
+    # belum punya harga (tidak terisi interpolasi) dibuang
+    df_week = get_weekly_index(versi_data).weekly(start_date, end_date)
+    df_week = df_week.dropna().reset_index(drop=True)
+    df_week_norm = z_normalization(df_week)
 
     st.markdown(
         '<h6 class="sub-subheading">Parameter Klaster</h6>', unsafe_allow_html=True
@@ -316,25 +349,40 @@ def pilih_jmlh_cluster():
     with col4:
         maxiter = st.number_input("Maks Iterasi", value=100)
 
-    if c == 3 and m == 1.5 and error == 0.0001 and maxiter == 100:
+    pita = st.slider(
+        "Pita Sakoe-Chiba DTW (%)",
+        min_value=5,
+        max_value=100,
+        value=100,
+        step=5,
+        help="Membatasi pergeseran waktu pada DTW, 100% berarti tanpa batasan",
+    )
+
+    if c == 3 and m == 1.5 and error == 0.0001 and maxiter == 100 and pita == 100:
         st.write("*parameter terbaik untuk model*")
 
     # Transpose untuk FCM
-    data_for_fcm = transpose_time_series_data(data_norm)
-
-    # Melatih model
-    df_evaluasi_cluster, df_derajat_keanggotaan = fcm_model(
-        data_for_fcm,
-        c=c,
-        m=m,
-        error=error,
-        maxiter=maxiter
+    data_for_fcm = transpose_time_series_data(df_week_norm)
+
+    # Melatih model, hasil yang sama diambil dari cache
+    key = (c, m, error, maxiter, pita, start_date, end_date, versi_data)
+    df_evaluasi_cluster, df_derajat_keanggotaan = get_result_cache().get_or_compute(
+        key,
+        lambda: fcm_model(
+            data_for_fcm,
+            c=c,
+            m=m,
+            error=error,
+            maxiter=maxiter,
+            window=sakoe_chiba_window(pita, data_for_fcm.shape[1]),
+        ),
     )
 
-    return df_evaluasi_cluster, df_derajat_keanggotaan, df_filtered, viz_clust
+    return df_evaluasi_cluster, df_derajat_keanggotaan, df_week, df_week_norm, viz_clust
 
 def visualisasi_hasil_cluster(
-    df_data,
+    df_week,
+    df_week_norm,
     df_cluster,
     options,
     datetime_col="Minggu ke",
@@ -344,7 +392,8 @@ def visualisasi_hasil_cluster(
     """
     Visualisasi dari hasil setiap klaster
     Parameter
-    df_data: DataFrame yang digunakan untuk visualisasi (data filter)
+    df_week: DataFrame mingguan rentang terpilih
+    df_week_norm: DataFrame mingguan ter-normalisasi rentang terpilih
     df_cluster: DataFrame dengan hasil defuzzifikasi dan komoditas
     options : Pilihan DataFrame akan ditampilkan dalam bentuk normalisasi atau data asli
     Output:
@@ -354,16 +403,11 @@ def visualisasi_hasil_cluster(
 
     clusters = sorted(df_cluster[cluster_col].unique())
 
-    # Mengubah ke bentuk mingguan
-    df_filtered_week = day_to_week(df_data)
-    # Normalisasi
-    df_filtered_norm = z_normalization(df_filtered_week)
-
     if options == "Data Asli":  # Pakai opsi normal
-        df_data = df_filtered_week
+        df_data = df_week
         y = "Harga (Rp)"
     else:
-        df_data = df_filtered_norm
+        df_data = df_week_norm
         # value_name="Nilai (Skala)"
         y = "Nilai (Skala)"
 
@@ -378,28 +422,17 @@ def visualisasi_hasil_cluster(
             st.warning(f"Tidak ada kolom ditemukan untuk Cluster {cl}")
             continue
 
-        # Ubah ke long format untuk mudah dipakai di plotly
-        data_long = df_data.melt(
-            id_vars=[datetime_col],
-            value_vars=col_in_df,
-            var_name="Komoditas",
-            value_name=y,
-        )
-
-        # Buat line chart untuk cluster ini
-        fig = px.line(
-            data_long,
-            x=datetime_col,
-            y=y,
-            color="Komoditas",
-            title=f"Cluster {cl}",
-        )
+        # Buat line chart untuk cluster ini (trace WebGL per komoditas)
+        fig = go.Figure(line_traces(df_data, datetime_col, col_in_df))
 
         # Layout styling
         fig.update_layout(
+            xaxis_title=datetime_col,
+            yaxis_title=y,
+            legend_title="Komoditas",
             height=250,
             margin=dict(t=25, b=20, l=10, r=10),
-            title=dict(x=0.5, xanchor="center"),
+            title=dict(text=f"Cluster {cl}", x=0.5, xanchor="center"),
             legend=dict(font=dict(size=10), orientation="v"),
         )
         fig.update_xaxes(showline=True, linewidth=1, linecolor="black", mirror=True)
@@ -409,47 +442,68 @@ def visualisasi_hasil_cluster(
 
 # =================== TAMPILAN ASLI   ======================
 
-st.markdown(
-    '<h2 class="big-font">CLUSTERING HARGA BAHAN PANGAN PROVINSI BANTEN</h2>',
-    unsafe_allow_html=True,
-)
-# st.markdown('<p class="width">Model dibangun menggunakan algoritma Fuzzy C-Means Clustering dengan jarak kedekatan Dynamic Time Warping (DTW)</p>', unsafe_allow_html=True)
-
-# Menampilkan Fuzzy C-Means
-colhead1, colhead2 = st.columns([2.5, 1.5])
-with colhead2:
-    df_evaluasi, df_derajat_keanggotaan, df_filtered, viz_clust_options = pilih_jmlh_cluster()
-
-    st.markdown('<p class="sub-subheading"> </p>', unsafe_allow_html=True)
-    metric1, metric2, metric3 = st.columns(3)
-    with metric1:
-        st.metric(label="MPC", value=df_evaluasi["MPC"].round(4))
-    with metric2:
-        st.metric(label="PE", value=df_evaluasi["PE"].round(4))
-    with metric3:
-        st.metric(label="XB", value=df_evaluasi["XB"].round(4))
+
+def main():
+    st.set_page_config(page_title="Dashboard FCM-DTW", layout="wide")
+    st.markdown(CSS, unsafe_allow_html=True)
+
+    data_norm = load_data_norm()
+    versi_data = data_version()
+    versi_data_norm = data_version(name=FILE_MINGGUAN_NORM)
 
     st.markdown(
-        '<h6 class="sub-subheading">Derajat Keanggotaan</h6>', unsafe_allow_html=True
+        '<h2 class="big-font">CLUSTERING HARGA BAHAN PANGAN PROVINSI BANTEN</h2>',
+        unsafe_allow_html=True,
     )
-    df_derajat_keanggotaan = df_derajat_keanggotaan.reset_index(drop=True)
-    st.dataframe(df_derajat_keanggotaan)
+    # st.markdown('<p class="width">Model dibangun menggunakan algoritma Fuzzy C-Means Clustering dengan jarak kedekatan Dynamic Time Warping (DTW)</p>', unsafe_allow_html=True)
+
+    # Menampilkan Fuzzy C-Means
+    colhead1, colhead2 = st.columns([2.5, 1.5])
+    with colhead2:
+        (
+            df_evaluasi,
+            df_derajat_keanggotaan,
+            df_week,
+            df_week_norm,
+            viz_clust_options,
+        ) = pilih_jmlh_cluster(versi_data)
+
+        st.markdown('<p class="sub-subheading"> </p>', unsafe_allow_html=True)
+        metric1, metric2, metric3 = st.columns(3)
+        with metric1:
+            st.metric(label="MPC", value=df_evaluasi["MPC"].round(4))
+        with metric2:
+            st.metric(label="PE", value=df_evaluasi["PE"].round(4))
+        with metric3:
+            st.metric(label="XB", value=df_evaluasi["XB"].round(4))
 
-with colhead1:
-    visualisasi_hasil_cluster(df_filtered, df_derajat_keanggotaan, viz_clust_options)
+        st.markdown(
+            '<h6 class="sub-subheading">Derajat Keanggotaan</h6>', unsafe_allow_html=True
+        )
+        df_derajat_keanggotaan = df_derajat_keanggotaan.reset_index(drop=True)
+        st.dataframe(df_derajat_keanggotaan)
 
-# Menghitung jarak pada DTW
-alignment_and_counting_dtw()
+    with colhead1:
+        visualisasi_hasil_cluster(
+            df_week, df_week_norm, df_derajat_keanggotaan, viz_clust_options
+        )
 
-diagram_garis_bapok(data)
+    # Menghitung jarak pada DTW
+    alignment_and_counting_dtw(data_norm, versi_data_norm)
+    heatmap_jarak_dtw(versi_data_norm)
 
+    diagram_garis_bapok(data_norm, versi_data)
 
-st.markdown("")
-st.markdown(
-    '<div class="footer">Dikembangkan oleh Alya Fauzia | 2025 Penelitian Skripsi</div>',
-    unsafe_allow_html=True,
-)
-st.markdown(
-    '<div class="footer">Kode dapat diakses <a href="https://github.com/ayalya/Harga-Bahan-Pangan/tree/main">di sini</a></div>',
-    unsafe_allow_html=True,
-)
+    st.markdown("")
+    st.markdown(
+        '<div class="footer">Dikembangkan oleh Alya Fauzia | 2025 Penelitian Skripsi</div>',
+        unsafe_allow_html=True,
+    )
+    st.markdown(
+        '<div class="footer">Kode dapat diakses <a href="https://github.com/ayalya/Harga-Bahan-Pangan/tree/main">di sini</a></div>',
+        unsafe_allow_html=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
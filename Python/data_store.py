@@ -0,0 +1,150 @@
+import os
+import glob
+import hashlib
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow opsional, tanpa cache kolumnar
+    pa = None
+    feather = None
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Lokasi data dan cache dapat diubah melalui environment variable
+DATA_DIR = os.environ.get(
+    "HARGA_PANGAN_DATA_DIR", os.path.join(ROOT_DIR, "Data", "csv")
+)
+CACHE_DIR = os.environ.get(
+    "HARGA_PANGAN_CACHE_DIR", os.path.join(ROOT_DIR, "Data", "cache")
+)
+
+FILE_HARIAN = "HargaBahanPangan2020-2024.csv"
+FILE_MINGGUAN_NORM = "data_mingguan_norm.csv"
+
+# Store kolumnar hasil konversi workbook Data/Excel, lihat ingest.py
+EXCEL_STORE_DIR = os.path.join(CACHE_DIR, "excel")
+FILE_STORE_HARIAN = "harga_harian.feather"
+
+# Nama panjang komoditas pada sumber data -> nama pendek yang dipakai model
+RENAME_KOMODITAS = {
+    "Beras Kualitas Medium I": "Beras",
+    "Bawang Merah Ukuran Sedang": "Bawang Merah",
+    "Bawang Putih Ukuran Sedang": "Bawang Putih",
+    "Cabai Merah Keriting": "Cabai Merah",
+    "Cabai Rawit Merah": "Cabai Rawit",
+    "Daging Sapi Kualitas 1": "Daging Sapi",
+    "Telur Ayam Ras Segar": "Telur Ayam",
+    "Daging Ayam Ras Segar": "Daging Ayam",
+    "Minyak Goreng Kemasan Bermerk 1": "Minyak Goreng",
+    "Gula Pasir Lokal": "Gula Pasir",
+}
+
+
+def file_checksum(path):
+    """Checksum SHA-256 sebuah file"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def clean_harga_harian(data):
+    """
+    Membersihkan data harian mentah: membuang kolom kategori umum, mengganti
+    nama komoditas menjadi nama pendek, dan mengubah kolom tanggal.
+    """
+    data = data.drop(list(RENAME_KOMODITAS.values()), axis=1)
+    data = data.rename(columns={"Komoditas (Rp)": "Tanggal", **RENAME_KOMODITAS})
+    data["Tanggal"] = pd.to_datetime(data["Tanggal"], format="%d/%m/%Y")
+    return data
+
+
+def clean_mingguan_norm(df):
+    """Membersihkan data mingguan ternormalisasi hasil ekspor notebook"""
+    return df.drop(columns=["Tahun", "Unnamed: 0"])
+
+
+def _cached_read(name, clean, data_dir=None, cache_dir=None):
+    """
+    Membaca file CSV `name` lewat cache Feather. Cache diberi nama berdasarkan
+    checksum file sumber sehingga otomatis tidak dipakai lagi bila sumber
+    berubah; cache lama dihapus. Tanpa pyarrow, CSV dibaca langsung.
+    """
+    data_dir = data_dir or DATA_DIR
+    cache_dir = cache_dir or CACHE_DIR
+    source = os.path.join(data_dir, name)
+
+    if feather is None:
+        return clean(pd.read_csv(source))
+
+    stem = os.path.splitext(name)[0]
+    checksum = file_checksum(source)
+    cache_path = os.path.join(cache_dir, f"{stem}-{checksum[:16]}.feather")
+
+    if os.path.exists(cache_path):
+        table = feather.read_table(cache_path, memory_map=True)
+        return table.to_pandas()
+
+    data = clean(pd.read_csv(source))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(cache_dir, f"{stem}-*.feather")):
+        os.remove(stale)
+    write_feather(data, cache_path)
+    return data
+
+
+def write_feather(data, path):
+    """Menulis DataFrame ke file Feather tanpa kompresi secara atomik"""
+    if feather is None:
+        raise ImportError("pyarrow diperlukan untuk menulis file Feather")
+    tmp_path = path + ".tmp"
+    feather.write_feather(
+        pa.Table.from_pandas(data, preserve_index=False),
+        tmp_path,
+        compression="uncompressed",
+    )
+    os.replace(tmp_path, path)
+
+
+def load_excel_store(store_dir=None):
+    """
+    Data harga harian gabungan dari store kolumnar hasil `python ingest.py`.
+    """
+    path = os.path.join(store_dir or EXCEL_STORE_DIR, FILE_STORE_HARIAN)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Store {path} belum ada, jalankan `python ingest.py` terlebih dahulu"
+        )
+    if feather is None:
+        raise ImportError("pyarrow diperlukan untuk membaca store Feather")
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def load_harga_harian(data_dir=None, cache_dir=None, source="csv"):
+    """
+    Data harga harian yang sudah dibersihkan.
+    Parameter:
+    - source: "csv" (data 2020-2024 di Data/csv) atau "excel" (store hasil
+      konversi workbook Data/Excel, lihat ingest.py)
+    """
+    if source == "excel":
+        store_dir = os.path.join(cache_dir, "excel") if cache_dir else None
+        return load_excel_store(store_dir)
+    if source != "csv":
+        raise ValueError(f"source harus 'csv' atau 'excel', bukan {source!r}")
+    return _cached_read(FILE_HARIAN, clean_harga_harian, data_dir, cache_dir)
+
+
+def load_mingguan_norm(data_dir=None, cache_dir=None):
+    """Data harga mingguan yang sudah dinormalisasi"""
+    return _cached_read(FILE_MINGGUAN_NORM, clean_mingguan_norm, data_dir, cache_dir)
+
+
+def data_version(data_dir=None, name=FILE_HARIAN):
+    """Versi data: checksum file sumber (default data harian)"""
+    return file_checksum(os.path.join(data_dir or DATA_DIR, name))
@@ -0,0 +1,207 @@
+import os
+import sys
+import glob
+import json
+import shutil
+import hashlib
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from dtaidistance import dtw
+
+from data_store import CACHE_DIR, FILE_MINGGUAN_NORM, data_version, load_mingguan_norm
+from model import komoditas, sakoe_chiba_window
+
+STORE_DIR = os.path.join(CACHE_DIR, "dtw")
+
+# Pilihan pita Sakoe-Chiba (persen) pada dashboard
+PITA = tuple(range(5, 101, 5))
+
+
+def store_key(versi, names, pita):
+    """Kunci store: versi data, urutan komoditas, dan daftar pita"""
+    isi = json.dumps({"versi": versi, "names": list(names), "pita": list(pita)})
+    return hashlib.sha256(isi.encode()).hexdigest()[:16]
+
+
+def _pair_index(i, j, k):
+    """Nomor pasangan (i < j) pada urutan i=0..k-1, j=i+1..k-1"""
+    return i * k - i * (i + 1) // 2 + (j - i - 1)
+
+
+def _path_cost(s1, s2, path):
+    """Jarak DTW sepanjang sebuah path"""
+    return np.sqrt(np.sum((s1[path[:, 0]] - s2[path[:, 1]]) ** 2))
+
+
+def _warping_pair(s1, s2, windows):
+    """Jarak DTW dan best path satu pasangan series untuk semua window"""
+    hasil = []
+    for window in windows:
+        distance, paths = dtw.warping_paths_fast(s1, s2, window=window)
+        path = np.asarray(dtw.best_path(paths), dtype=np.int32)
+        # Matriks warping_paths_fast untuk beberapa lebar window tidak
+        # menghasilkan path optimal; path diperiksa dan dihitung ulang
+        # dengan versi Python bila biayanya tidak sama dengan jaraknya
+        if not np.isclose(_path_cost(s1, s2, path), distance):
+            distance, paths = dtw.warping_paths(s1, s2, window=window)
+            path = np.asarray(dtw.best_path(paths), dtype=np.int32)
+        hasil.append((distance, path))
+    return hasil
+
+
+def build_store(df, versi, names=komoditas, pita=PITA, store_dir=None, n_jobs=None):
+    """
+    Menghitung jarak DTW dan best path semua pasangan komoditas untuk setiap
+    pita Sakoe-Chiba secara paralel (process pool), lalu menyimpannya ke
+    folder store berisi file .npy yang dibaca memory-mapped oleh DTWStore.
+    Parameter:
+    - df: DataFrame series ternormalisasi, satu kolom per komoditas
+    - versi: versi data, bagian dari kunci invalidasi
+    - names: kolom komoditas
+    - pita: daftar lebar pita (persen)
+    - store_dir: folder induk store
+    - n_jobs: jumlah proses, None memakai jumlah CPU
+    Output:
+    - path: folder store
+    """
+    store_dir = store_dir or STORE_DIR
+    names = list(names)
+    series = df[names].to_numpy(dtype=np.float64).T
+    k, panjang = series.shape
+    windows = [sakoe_chiba_window(persen, panjang) for persen in pita]
+    pairs = [(i, j) for i in range(k) for j in range(i + 1, k)]
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(_warping_pair, series[i], series[j], windows)
+            for i, j in pairs
+        ]
+        results = [future.result() for future in futures]
+
+    # Jarak (pita x k x k) dan path disambung per pita dengan offset
+    distances = np.zeros((len(pita), k, k))
+    offsets = np.zeros((len(pita), len(pairs) + 1), dtype=np.int64)
+    paths = []
+    for w in range(len(pita)):
+        for p, (i, j) in enumerate(pairs):
+            distance, path = results[p][w]
+            distances[w, i, j] = distances[w, j, i] = distance
+            offsets[w, p + 1] = offsets[w, p] + len(path)
+            paths.append(path)
+    offsets[1:] += np.cumsum(offsets[:-1, -1])[:, np.newaxis]
+
+    key = store_key(versi, names, pita)
+    path = os.path.join(store_dir, f"dtw-{key}")
+    os.makedirs(store_dir, exist_ok=True)
+    # Folder sementara unik per proses (diawali titik, tidak cocok "dtw-*")
+    # agar beberapa sesi yang membangun store bersamaan tidak saling menimpa
+    tmp_path = tempfile.mkdtemp(prefix=f".dtw-{key}-", dir=store_dir)
+    try:
+        os.chmod(tmp_path, 0o755)  # mkdtemp hanya untuk pemiliknya
+        np.save(os.path.join(tmp_path, "distances.npy"), distances)
+        np.save(os.path.join(tmp_path, "offsets.npy"), offsets)
+        np.save(os.path.join(tmp_path, "paths.npy"), np.concatenate(paths))
+        meta = {"versi": versi, "names": names, "pita": list(pita), "panjang": panjang}
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Proses lain sudah menerbitkan store dengan kunci yang sama
+            if not os.path.exists(os.path.join(path, "meta.json")):
+                raise
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    # Store lama (kunci berbeda) baru dihapus setelah store ini terbit
+    for stale in glob.glob(os.path.join(store_dir, "dtw-*")):
+        if stale != path:
+            shutil.rmtree(stale, ignore_errors=True)
+    return path
+
+
+class DTWStore:
+    """
+    Store jarak DTW dan best path semua pasangan komoditas hasil build_store.
+    Array dibaca memory-mapped, sehingga membuka store dan mengambil jarak
+    atau path satu pasangan tidak menghitung DTW ulang.
+    Parameter:
+    - path: folder store
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.versi = meta["versi"]
+        self.names = meta["names"]
+        self.pita = meta["pita"]
+        self.panjang = meta["panjang"]
+        self._posisi = {nama: i for i, nama in enumerate(self.names)}
+        self._distances = np.load(os.path.join(path, "distances.npy"), mmap_mode="r")
+        self._offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        self._paths = np.load(os.path.join(path, "paths.npy"), mmap_mode="r")
+
+    def _pita_index(self, persen):
+        return self.pita.index(persen)
+
+    def has(self, persen):
+        """Apakah pita (persen) tersedia di store"""
+        return persen in self.pita
+
+    def distance(self, name1, name2, persen=100):
+        """Jarak DTW dua komoditas"""
+        i, j = self._posisi[name1], self._posisi[name2]
+        return float(self._distances[self._pita_index(persen), i, j])
+
+    def best_path(self, name1, name2, persen=100):
+        """Best path DTW (L x 2): indeks series name1 dan name2"""
+        i, j = self._posisi[name1], self._posisi[name2]
+        if i == j:
+            return np.repeat(np.arange(self.panjang)[:, np.newaxis], 2, axis=1)
+        w = self._pita_index(persen)
+        p = _pair_index(min(i, j), max(i, j), len(self.names))
+        path = np.asarray(self._paths[self._offsets[w, p] : self._offsets[w, p + 1]])
+        return path if i < j else path[:, ::-1]
+
+    def distance_matrix(self, persen=100):
+        """Matriks jarak DTW semua pasangan komoditas"""
+        dm = np.asarray(self._distances[self._pita_index(persen)])
+        return pd.DataFrame(dm, index=self.names, columns=self.names)
+
+
+def open_store(df, versi, names=komoditas, pita=PITA, store_dir=None, n_jobs=None):
+    """
+    Membuka store untuk versi data ini; bila belum ada (atau versi data
+    berubah) store dibangun terlebih dahulu.
+    """
+    key = store_key(versi, names, pita)
+    path = os.path.join(store_dir or STORE_DIR, f"dtw-{key}")
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        path = build_store(df, versi, names, pita, store_dir, n_jobs)
+    return DTWStore(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Membangun store jarak DTW dan best path semua pasangan"
+    )
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--output", default=STORE_DIR, help="Folder store")
+    args = parser.parse_args(argv)
+
+    versi = data_version(name=FILE_MINGGUAN_NORM)
+    path = build_store(
+        load_mingguan_norm(), versi, store_dir=args.output, n_jobs=args.jobs
+    )
+    print(f"Store DTW disimpan di {path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from model import komoditas, period_number
+
+
+def week_number(tanggal):
+    """Nomor minggu setiap tanggal, sama dengan penomoran pada day_to_week"""
+    return period_number(tanggal, freq="W")
+
+
+def _mean_positive(rows, groups):
+    """Rata-rata harga positif per kelompok, sama dengan agregasi day_to_week"""
+    return rows.where(rows > 0).groupby(groups).mean()
+
+
+class IncrementalWeekly:
+    """
+    Agregasi mingguan yang diperbarui secara inkremental saat data harian baru
+    masuk. Hanya rata-rata minggu yang terdampak dan segmen interpolasi di
+    sekitarnya yang dihitung ulang; hasilnya identik (bit per bit) dengan
+    day_to_week pada seluruh data harian.
+    Parameter:
+    - data: DataFrame harian dengan kolom "Tanggal" (hasil load_data)
+    - col: kolom komoditas yang diinterpolasi
+    Atribut:
+    - daily: data harian terurut
+    - weekly: data mingguan hasil interpolasi (sama dengan day_to_week)
+    """
+
+    def __init__(self, data, col=komoditas):
+        self.col = list(col)
+        daily = data.drop(columns=["Minggu ke"], errors="ignore")
+        self.daily = daily.sort_values(by="Tanggal").reset_index(drop=True)
+        self.columns = [kolom for kolom in self.daily.columns if kolom != "Tanggal"]
+        self._week = week_number(self.daily["Tanggal"])
+
+        # Rata-rata mingguan sebelum interpolasi
+        raw = _mean_positive(
+            self.daily[self.columns], pd.array(self._week, dtype="Int64")
+        )
+        raw.index.name = "Minggu ke"
+        self._raw = raw.reset_index()
+
+        self.weekly = self._raw.copy()
+        self.weekly[self.col] = self._raw[self.col].interpolate(method="linear")
+
+    def append(self, new_rows):
+        """
+        Menambahkan data harian baru (tanggal yang sudah ada akan diganti) dan
+        memperbarui minggu yang terdampak.
+        Parameter:
+        - new_rows: DataFrame harian dengan kolom yang sama seperti data awal
+        Output:
+        - weeks: daftar nomor minggu yang diperbarui
+        """
+        new_rows = new_rows.drop(columns=["Minggu ke"], errors="ignore")
+        new_rows = new_rows[self.daily.columns].sort_values(by="Tanggal")
+        if new_rows.empty:
+            return []
+
+        # Gabungkan ke data harian, urutan tanggal tetap terjaga
+        replaced = self.daily["Tanggal"].isin(new_rows["Tanggal"])
+        if (
+            replaced.any()
+            or new_rows["Tanggal"].iloc[0] <= self.daily["Tanggal"].iloc[-1]
+        ):
+            daily = pd.concat([self.daily[~replaced], new_rows], ignore_index=True)
+            self.daily = daily.sort_values(by="Tanggal", kind="mergesort").reset_index(
+                drop=True
+            )
+            self._week = week_number(self.daily["Tanggal"])
+        else:
+            self.daily = pd.concat([self.daily, new_rows], ignore_index=True)
+            self._week = np.concatenate([self._week, week_number(new_rows["Tanggal"])])
+
+        weeks = sorted(set(week_number(new_rows["Tanggal"]).tolist()))
+        positions = [self._update_week(week) for week in weeks]
+        self._patch_interpolation(min(positions), max(positions))
+        return weeks
+
+    def _update_week(self, week):
+        """Menghitung ulang rata-rata satu minggu, mengembalikan posisi barisnya"""
+        lo, hi = np.searchsorted(self._week, [week, week + 1])
+        mean = _mean_positive(
+            self.daily.iloc[lo:hi][self.columns], np.zeros(hi - lo, dtype=np.int64)
+        ).iloc[0]
+
+        minggu = self._raw["Minggu ke"].to_numpy(dtype=np.int64)
+        pos = int(np.searchsorted(minggu, week))
+        if pos < len(minggu) and minggu[pos] == week:
+            self._raw.loc[pos, self.columns] = mean.to_numpy()
+            self.weekly.loc[pos, self.columns] = mean.to_numpy()
+            return pos
+
+        # Minggu baru: sisipkan baris
+        row = pd.DataFrame([mean.to_numpy()], columns=self.columns)
+        row.insert(0, "Minggu ke", pd.array([week], dtype="Int64"))
+        self._raw = pd.concat(
+            [self._raw.iloc[:pos], row, self._raw.iloc[pos:]], ignore_index=True
+        )
+        self.weekly = pd.concat(
+            [self.weekly.iloc[:pos], row, self.weekly.iloc[pos:]], ignore_index=True
+        )
+        return pos
+
+    def _patch_interpolation(self, first, last):
+        """
+        Interpolasi ulang hanya segmen yang dipengaruhi baris first..last:
+        dari nilai valid sebelum first hingga nilai valid setelah last.
+        """
+        for kolom in self.col:
+            valid = np.flatnonzero(self._raw[kolom].notna().to_numpy())
+            before = valid[valid < first]
+            after = valid[valid > last]
+            start = before[-1] if len(before) else first
+            stop = after[0] + 1 if len(after) else len(self._raw)
+
+            segment = self._raw[kolom].iloc[start:stop].interpolate(method="linear")
+            self.weekly.loc[start : stop - 1, kolom] = segment.to_numpy()
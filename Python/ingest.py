@@ -0,0 +1,279 @@
+import os
+import re
+import sys
+import json
+import argparse
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_store import (
+    ROOT_DIR,
+    RENAME_KOMODITAS,
+    EXCEL_STORE_DIR,
+    FILE_STORE_HARIAN,
+    file_checksum,
+    write_feather,
+)
+
+EXCEL_DIR = os.environ.get(
+    "HARGA_PANGAN_EXCEL_DIR", os.path.join(ROOT_DIR, "Data", "Excel")
+)
+MANIFEST = "manifest.json"
+
+# Workbook ekspor harga harian mentah yang digabung menjadi store harian,
+# berurutan dari yang paling lama; tanggal yang sama diambil dari workbook
+# yang terakhir. Workbook lain (mis. hasil imputasi) tetap dikonversi per
+# sheet, tetapi tidak ikut digabung.
+SUMBER_HARIAN = [
+    "Harga Bahan Pangan Harian.xlsx",
+    "HargaBahanPanganJuli2025.xlsx",
+    "HargaBahanPangan2025.xlsx",
+    "Tabel Harga Berdasarkan Daerah (1).xlsx",
+]
+
+
+# ===================== PARSING SHEET =========================
+
+
+def parse_tanggal(value):
+    """
+    Tanggal pada sumber Excel berformat "dd/ mm/ yyyy". Sel yang sudah
+    dikonversi Excel menjadi tanggal terbaca sebagai mm/dd, sehingga hari dan
+    bulannya ditukar kembali. Nilai yang bukan tanggal menjadi NaT.
+    """
+    if isinstance(value, (datetime.datetime, pd.Timestamp)):
+        if pd.isna(value):
+            return pd.NaT
+        return pd.Timestamp(year=value.year, month=value.day, day=value.month)
+    if not isinstance(value, str):
+        return pd.NaT
+    return pd.to_datetime(value.replace(" ", ""), format="%d/%m/%Y", errors="coerce")
+
+
+def parse_harga(values):
+    """Harga "-" atau kosong menjadi NaN, pemisah ribuan "," dibuang"""
+    values = pd.Series(values, dtype=object)
+    text = values.astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce").astype(np.float64)
+
+
+def _sheet_table(raw):
+    """
+    Mengubah isi sheet mentah (tanpa header) menjadi tabel tanggal x komoditas.
+    Dua tata letak dikenali:
+    - tanggal per kolom: baris pertama "No", "Komoditas (Rp)", tanggal...,
+      baris berikutnya satu komoditas per baris (ekspor harian)
+    - tanggal per baris: baris pertama "Komoditas (Rp)"/"Tanggal", nama
+      komoditas...; tabel berhenti di kolom header kosong pertama
+    Output:
+    - DataFrame dengan kolom "Tanggal" dan nama komoditas asli, atau None bila
+      tata letak tidak dikenali
+    """
+    if raw.shape[0] < 2 or raw.shape[1] < 2:
+        return None
+    header = raw.iloc[0].tolist()
+
+    if header[0] == "No" and header[1] == "Komoditas (Rp)":
+        names = raw.iloc[1:, 1]
+        table = raw.iloc[1:, 2:].T
+        table.columns = names.tolist()
+        tanggal = header[2:]
+    elif header[0] in ("Komoditas (Rp)", "Tanggal"):
+        kosong = [i for i, nama in enumerate(header[1:], 1) if pd.isna(nama)]
+        stop = kosong[0] if kosong else len(header)
+        table = raw.iloc[1:, 1:stop]
+        table.columns = header[1:stop]
+        tanggal = raw.iloc[1:, 0].tolist()
+    else:
+        return None
+
+    table = table.loc[:, ~pd.Index(table.columns).duplicated()]
+    data = pd.DataFrame(
+        {nama: parse_harga(table[nama].to_numpy()) for nama in table.columns}
+    )
+    data.insert(0, "Tanggal", [parse_tanggal(value) for value in tanggal])
+    # Baris ringkasan (mis. "Rata-Rata Pembulatan") tidak bertanggal
+    data = data[data["Tanggal"].notna()].reset_index(drop=True)
+    data["Tanggal"] = data["Tanggal"].astype("datetime64[ns]")
+    return data
+
+
+def short_names(data):
+    """
+    Memakai nama pendek komoditas seperti load_data: kolom kategori umum
+    dibuang dan nama panjang diganti nama pendek.
+    """
+    kategori = [nama for nama in RENAME_KOMODITAS.values() if nama in data.columns]
+    data = data.drop(columns=kategori)
+    data = data.rename(columns=RENAME_KOMODITAS)
+    return data[["Tanggal"] + [k for k in RENAME_KOMODITAS.values() if k in data]]
+
+
+def read_workbook(path):
+    """
+    Membaca semua sheet sebuah workbook sekali (openpyxl) dan mengubahnya ke
+    tabel harian bernama pendek.
+    Output:
+    - dict nama sheet -> DataFrame; sheet kosong atau tata letak tidak dikenali
+      bernilai None
+    """
+    sheets = pd.read_excel(path, sheet_name=None, header=None, dtype=object)
+    hasil = {}
+    for sheet, raw in sheets.items():
+        table = _sheet_table(raw)
+        hasil[sheet] = None if table is None else short_names(table)
+    return hasil
+
+
+# ===================== STORE KOLUMNAR =========================
+
+
+def _slug(text):
+    return re.sub(r"[^0-9A-Za-z]+", "-", text).strip("-").lower()
+
+
+def _read_manifest(store_dir):
+    path = os.path.join(store_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {"files": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def combine_harian(tables):
+    """
+    Menggabungkan tabel harian beberapa sheet berdasarkan tanggal; untuk
+    tanggal yang sama, baris dari tabel yang lebih akhir dipakai.
+    """
+    data = pd.concat(tables, ignore_index=True)
+    data = data.drop_duplicates(subset="Tanggal", keep="last")
+    return data.sort_values(by="Tanggal").reset_index(drop=True)
+
+
+def ingest(excel_dir=None, store_dir=None, sources=SUMBER_HARIAN, force=False):
+    """
+    Mengonversi semua workbook di excel_dir menjadi file Feather per sheet dan
+    satu store harian gabungan (FILE_STORE_HARIAN) yang dibaca load_data.
+    Workbook yang checksum-nya sama dengan manifest tidak dibaca ulang.
+    Parameter:
+    - excel_dir: folder workbook (default Data/Excel)
+    - store_dir: folder store (default Data/cache/excel)
+    - sources: workbook yang digabung ke store harian, urut dari yang paling lama
+    - force: konversi ulang semua workbook
+    Output:
+    - DataFrame status per sheet: File, Sheet, Status, Baris, Awal, Akhir
+    """
+    excel_dir = excel_dir or EXCEL_DIR
+    store_dir = store_dir or EXCEL_STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+
+    manifest = _read_manifest(store_dir)
+    files = {}
+    laporan = []
+    berubah = force
+    for name in sorted(os.listdir(excel_dir)):
+        if not name.endswith(".xlsx") or name.startswith("~$"):
+            continue
+        checksum = file_checksum(os.path.join(excel_dir, name))
+        entry = manifest["files"].get(name)
+        if (
+            not force
+            and entry is not None
+            and entry["sha256"] == checksum
+            and all(
+                os.path.exists(os.path.join(store_dir, sheet["file"]))
+                for sheet in entry["sheets"].values()
+                if sheet["file"] is not None
+            )
+        ):
+            files[name] = entry
+            for sheet, info in entry["sheets"].items():
+                laporan.append((name, sheet, "tidak berubah", info))
+            continue
+
+        berubah = berubah or name in sources
+        sheets = {}
+        stem = _slug(os.path.splitext(name)[0])
+        for sheet, data in read_workbook(os.path.join(excel_dir, name)).items():
+            if data is None or data.empty:
+                info = {"file": None, "rows": 0, "start": None, "end": None}
+                laporan.append((name, sheet, "dilewati", info))
+                sheets[sheet] = info
+                continue
+            file = f"{stem}--{_slug(sheet)}-{checksum[:16]}.feather"
+            write_feather(data, os.path.join(store_dir, file))
+            info = {
+                "file": file,
+                "rows": len(data),
+                "start": data["Tanggal"].min().strftime("%Y-%m-%d"),
+                "end": data["Tanggal"].max().strftime("%Y-%m-%d"),
+            }
+            laporan.append((name, sheet, "dikonversi", info))
+            sheets[sheet] = info
+        files[name] = {"sha256": checksum, "sheets": sheets}
+
+    # Workbook yang dihapus dari excel_dir ikut keluar dari store gabungan
+    berubah = berubah or any(
+        name in sources and name not in files for name in manifest["files"]
+    )
+    harian = os.path.join(store_dir, FILE_STORE_HARIAN)
+    if berubah or not os.path.exists(harian):
+        tables = [
+            pd.read_feather(os.path.join(store_dir, info["file"]))
+            for name in sources
+            if name in files
+            for info in files[name]["sheets"].values()
+            if info["file"] is not None
+        ]
+        if tables:
+            write_feather(combine_harian(tables), harian)
+
+    # File sheet yang tidak lagi tercatat di manifest dihapus
+    aktif = {
+        info["file"]
+        for entry in files.values()
+        for info in entry["sheets"].values()
+        if info["file"] is not None
+    }
+    for file in os.listdir(store_dir):
+        if file.endswith(".feather") and file != FILE_STORE_HARIAN:
+            if file not in aktif:
+                os.remove(os.path.join(store_dir, file))
+
+    _write_manifest(store_dir, {"files": files})
+    return pd.DataFrame(
+        [
+            (name, sheet, status, info["rows"], info["start"], info["end"])
+            for name, sheet, status, info in laporan
+        ],
+        columns=["File", "Sheet", "Status", "Baris", "Awal", "Akhir"],
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Konversi workbook Excel harga pangan ke store kolumnar"
+    )
+    parser.add_argument("--excel-dir", default=None, help="Folder workbook Excel")
+    parser.add_argument("--store-dir", default=None, help="Folder store Feather")
+    parser.add_argument(
+        "--force", action="store_true", help="Konversi ulang semua workbook"
+    )
+    args = parser.parse_args(argv)
+
+    laporan = ingest(args.excel_dir, args.store_dir, force=args.force)
+    with pd.option_context("display.width", 160, "display.max_colwidth", 60):
+        print(laporan.to_string(index=False))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
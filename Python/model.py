@@ -1,9 +1,26 @@
 import numpy as np
 import pandas as pd
-import math
-from tqdm import tqdm
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dtaidistance import dtw, preprocessing
 
+from data_store import load_harga_harian
+from validity import (
+    INDEKS,
+    INDEKS_DEFAULT,
+    compactness_terms,
+    compute_indices,
+    modified_partition_coefficient,
+    needs_distance,
+    partition_coefficient,
+    partition_entropy,
+    xie_beni,
+)
+
 komoditas = [
     "Beras",
     "Bawang Merah",
@@ -18,81 +35,110 @@ komoditas = [
 ]
 
 
-def load_data():
-    data = pd.read_csv(
-        "https://github.com/ayalya/Harga-Bahan-Pangan/raw/main/Data/csv/HargaBahanPangan2020-2024.csv"
-    )
-    data = data.drop(komoditas, axis=1)
-
-    data = data.rename(
-        columns={
-            "Komoditas (Rp)": "Tanggal",
-            "Beras Kualitas Medium I": "Beras",
-            "Bawang Merah Ukuran Sedang": "Bawang Merah",
-            "Bawang Putih Ukuran Sedang": "Bawang Putih",
-            "Cabai Merah Keriting": "Cabai Merah",
-            "Cabai Rawit Merah": "Cabai Rawit",
-            "Daging Sapi Kualitas 1": "Daging Sapi",
-            "Telur Ayam Ras Segar": "Telur Ayam",
-            "Daging Ayam Ras Segar": "Daging Ayam",
-            "Minyak Goreng Kemasan Bermerk 1": "Minyak Goreng",
-            "Gula Pasir Lokal": "Gula Pasir",
-        }
-    )
-    data["Tanggal"] = pd.to_datetime(data["Tanggal"], format="%d/%m/%Y")
-    return data
+def load_data(data_dir=None, source="csv"):
+    """
+    Memuat data harga harian dari folder Data/csv (atau data_dir) melalui
+    cache kolumnar lokal, atau dari store hasil konversi Excel bila
+    source="excel" (lihat data_store dan ingest.py).
+    """
+    return load_harga_harian(data_dir=data_dir, source=source)
 
 
-def day_to_week(data):
+# Kolom nomor periode untuk setiap frekuensi agregasi
+KOLOM_PERIODE = {"D": "Hari ke", "W": "Minggu ke", "2W": "Periode ke", "M": "Bulan ke"}
+
+# Awal periode ke-2 (periode ke-1 adalah sisa hari sebelum anchor). Minggu
+# ke-2 dimulai Senin 6 Januari 2020, minggu ke-1 adalah 1-5 Januari 2020.
+ANCHOR_PERIODE = {
+    "D": pd.Timestamp("2020-01-02"),
+    "W": pd.Timestamp("2020-01-06"),
+    "2W": pd.Timestamp("2020-01-06"),
+    "M": pd.Timestamp("2020-01-01"),
+}
+
+
+def _panjang_periode(freq):
+    """Panjang periode dalam hari untuk frekuensi "D", "W", "2W", atau "<n>D" """
+    if freq in ("D", "W", "2W"):
+        return {"D": 1, "W": 7, "2W": 14}[freq]
+    if freq.endswith("D") and freq[:-1].isdigit() and int(freq[:-1]) > 0:
+        return int(freq[:-1])
+    raise ValueError(f"Frekuensi tidak dikenal: {freq}")
+
+
+def period_column(freq="W"):
+    """Nama kolom nomor periode untuk suatu frekuensi"""
+    return KOLOM_PERIODE.get(freq, "Periode ke")
+
+
+def period_number(tanggal, freq="W", anchor=None):
     """
-    Mengubah bentuk data dari tanggal ke mingguan
+    Nomor periode setiap tanggal.
+    Parameter:
+    - tanggal: Series datetime
+    - freq: "D" (harian), "W" (mingguan), "2W" (dua mingguan), "M" (bulanan),
+      atau "<n>D" (setiap n hari)
+    - anchor: awal periode ke-2; periode ke-1 adalah sisa hari sebelum anchor.
+      Untuk "M", bulan anchor adalah periode ke-1.
+    Output:
+    - array nomor periode (int64)
     """
-    # Urutkan berdasarkan tanggal
-    data_mingguan = data.sort_values(by="Tanggal").reset_index(drop=True)
+    if anchor is None:
+        anchor = ANCHOR_PERIODE.get(freq, ANCHOR_PERIODE["W"])
+    anchor = pd.Timestamp(anchor)
 
-    # Membuat minggu di kolom pertama
-    data_mingguan["Minggu ke"] = None
-    data.loc[data["Tanggal"].between("2020-01-01", "2020-01-03"), "Minggu ke"] = 1
+    if freq == "M":
+        bulan = (tanggal.dt.year - anchor.year) * 12 + (tanggal.dt.month - anchor.month)
+        return (bulan + 1).to_numpy(dtype=np.int64)
 
-    # Filter hari kerja
-    data_sisa = data.loc[
-        data_mingguan["Minggu ke"].isna() & data["Tanggal"].dt.weekday < 5
-    ].copy()
+    hari = (tanggal - anchor).dt.days
+    return (hari // _panjang_periode(freq) + 2).to_numpy(dtype=np.int64)
 
-    # Hitung minggu ke berdasarkan hari kerja setelah 3 Januari 2020
-    data_sisa["Minggu ke"] = (
-        (data_sisa["Tanggal"] - pd.Timestamp("2020-01-06")).dt.days // 7
-    ) + 2
 
-    # gabungkan kembali data
-    data_mingguan.update(data_sisa)
+def resample_data(data, freq="W", anchor=None, col=komoditas):
+    """
+    Mengagregasi data harian menjadi rata-rata per periode (harga <= 0 dan
+    kosong diabaikan), lalu mengisi periode kosong dengan interpolasi linear.
+    Parameter:
+    - data: DataFrame harian dengan kolom "Tanggal"
+    - freq, anchor: lihat period_number
+    - col: kolom komoditas yang diinterpolasi
+    Output:
+    - DataFrame dengan kolom nomor periode (lihat period_column) dan harga
+    """
+    kolom_periode = period_column(freq)
+    data = data.drop(columns=list(KOLOM_PERIODE.values()), errors="ignore")
+    nilai = data.drop(columns=["Tanggal"])
 
-    # data_mingguan['Tahun'] = data['Tanggal'].dt.year
+    # Agregasi tervektorisasi: harga tidak positif dijadikan NaN lalu dirata-rata
+    nomor = pd.array(period_number(data["Tanggal"], freq, anchor), dtype="Int64")
+    nilai = nilai.where(nilai > 0)
+    data_periode = nilai.groupby(nomor).mean()
+    data_periode.index.name = kolom_periode
+    data_periode = data_periode.reset_index()
 
-    data_mingguan["Minggu ke"] = data_mingguan["Minggu ke"].astype("Int64")
+    # Mengisi nilai yang kosong dengan rata-rata sebelum dan sesudah nilai kosong
+    data_periode[col] = data_periode[col].interpolate(method="linear")
 
-    data_mingguan = data_mingguan.drop(columns=["Tanggal"])
-    # Hitung rata-rata per minggu, otomatis mengabaikan NaN
-    data_mingguan = (
-        data_mingguan.groupby("Minggu ke")
-        .agg(lambda x: x[x > 0].mean(skipna=True))
-        .reset_index()
-    )
+    return data_periode
 
-    # Mengisi nilai yang kosong dengan rata-rata sebelum dan sesudah nilai kosong
-    data_mingguan[komoditas] = data_mingguan[komoditas].interpolate(method="linear")
 
-    return data_mingguan
+def day_to_week(data):
+    """
+    Mengubah bentuk data dari tanggal ke mingguan
+    """
+    return resample_data(data, freq="W")
 
 
-def z_normalization(df, col=komoditas):
+def z_normalization(df, col=komoditas, dtype=np.float64):
     """Fungsi untuk standarisasi data pada masing-masing harga pangan
     Parameter:
     df : DataFrame yang berisi harga pangan
     col : kolom yang akan distandarisasi (list)
+    dtype : tipe data hasil normalisasi (np.float64 atau np.float32)
     """
     df_norm = df.copy()
-    df_norm[col] = preprocessing.znormal(df[col])
+    df_norm[col] = preprocessing.znormal(df[col]).astype(dtype, copy=False)
     return df_norm
 
 
@@ -102,24 +148,64 @@ def transpose_time_series_data(data):
     - m: data time-series
     - n: variable komoditas pangan
     """
-    data_for_fcm = data.drop(columns=["Minggu ke"])
+    data_for_fcm = data.drop(columns=list(KOLOM_PERIODE.values()), errors="ignore")
     data_for_fcm = data_for_fcm.T.values
     return data_for_fcm
 
 
+def prepare_data(data, freq="W", anchor=None, dtype=np.float64):
+    """
+    Menyiapkan data harian menjadi input FCM: agregasi periode (default
+    mingguan), normalisasi, transpose. Hasilnya tidak bergantung pada c dan m
+    sehingga cukup dihitung sekali. dtype=np.float32 menghasilkan mode
+    ringkas: series, centroid, dan keanggotaan FCM ikut float32.
+    """
+    data_mingguan = resample_data(data, freq=freq, anchor=anchor)
+    # Periode awal tanpa harga tidak terisi interpolasi, dibuang
+    data_mingguan = data_mingguan.dropna().reset_index(drop=True)
+    data_scaled = z_normalization(data_mingguan, dtype=dtype)
+    return transpose_time_series_data(data_scaled)
+
+
 # ===================== MODEL =========================
-def initialize_membership(n_sampels, c):
+def progress_range(n, progress=True):
+    """range(n) dengan progress bar tqdm; tqdm baru diimpor bila dipakai"""
+    if not progress:
+        return range(n)
+    from tqdm import tqdm
+
+    return tqdm(range(n))
+
+
+def initialize_membership(n_sampels, c, random_state=None, dtype=np.float64):
     """
     Fungsi inisiasi membership (langkah 1). Dipilih secara acak.
     Parameter:
     - n_sampels: jumlah data
     - c: jumlah cluster
+    - random_state: seed generator acak, None memakai np.random global
+    - dtype: tipe data matriks keanggotaan
     Output:
     u: matriks keanggotaan
     """
-    u = np.random.rand(c, n_sampels)
+    if random_state is None:
+        u = np.random.rand(c, n_sampels)
+    else:
+        u = np.random.default_rng(random_state).random((c, n_sampels))
     u = u / np.sum(u, axis=0, keepdims=True)
-    return u
+    return u.astype(dtype, copy=False)
+
+
+def float_dtype(data):
+    """Tipe data pipeline: float32 bila data float32, selain itu float64"""
+    if np.asarray(data).dtype == np.float32:
+        return np.float32
+    return np.float64
+
+
+def as_float_array(data):
+    """Array data tanpa salinan bila sudah float32/float64"""
+    return np.asarray(data, dtype=float_dtype(data))
 
 
 def compute_centroids(data, u, m):
@@ -132,105 +218,870 @@ def compute_centroids(data, u, m):
     Output:
     centorids: pusat cluster (v_k)
     """
-    c = u.shape[0]
-    centroids = []
-    for j in range(c):
-        weights = u[j] ** m
-        weighted_sum = np.zeros_like(data[0])
-        denominator = np.sum(weights)
-        for i in range(len(data)):
-            weighted_sum += weights[i] * data[i]
-        centroid = weighted_sum / denominator
-        centroids.append(centroid)
+    data = as_float_array(data)
+    if isinstance(u, SparseMembership):
+        return _compute_centroids_sparse(data, u, m)
+    weights = u**m  # (c x n)
+
+    # Jumlah terbobot semua cluster sekaligus: (c x n) @ (n x t) -> (c x t)
+    denominator = np.sum(weights, axis=1, keepdims=True)
+    kosong = denominator[:, 0] == 0
+    if np.any(kosong):
+        # Cluster yang tidak terjangkau data mana pun (mis. karena max_step)
+        denominator[kosong] = 1
+        centroids = (weights @ data) / denominator
+        return _reseed_empty(centroids, kosong, data, u)
+    centroids = (weights @ data) / denominator
+    return centroids
+
+
+def _reseed_empty(centroids, kosong, data, value):
+    """
+    Cluster tanpa bobot diinisiasi ulang dengan data yang paling buruk
+    terwakili (keanggotaan terbesarnya paling kecil), bukan dibagi nol.
+    """
+    terburuk = np.argsort(np.max(value, axis=0), kind="stable")
+    centroids[kosong] = data[terburuk[: np.sum(kosong)]]
     return centroids
 
 
-def update_membership_dtw(data, centroids, m):
+def _compute_centroids_sparse(data, u, m):
+    """
+    Centroid dari SparseMembership, hanya n x k bobot yang dijumlahkan.
+    Cluster yang tidak menjadi kandidat data mana pun (bobot total nol)
+    diinisiasi ulang, lihat _reseed_empty.
+    """
+    weights = u.value**m  # (k x n)
+    dtype = np.result_type(weights, data)
+    numerator = np.zeros((u.c, data.shape[1]), dtype=dtype)
+    denominator = np.zeros(u.c, dtype=dtype)
+    for j in range(u.k):
+        np.add.at(numerator, u.index[j], weights[j][:, np.newaxis] * data)
+        np.add.at(denominator, u.index[j], weights[j])
+
+    kosong = denominator == 0
+    denominator[kosong] = 1
+    centroids = numerator / denominator[:, np.newaxis]
+    if np.any(kosong):
+        return _reseed_empty(centroids, kosong, data, u.value)
+    return centroids
+
+
+def compute_distance_matrix(
+    data, centroids, use_pruning=True, parallel=True, window=None, max_step=None
+):
+    """
+    Fungsi menghitung matriks jarak DTW setiap data ke setiap centroid.
+    Semua pasangan dihitung sekali dalam satu panggilan backend C dtaidistance
+    (paralel, multi-thread).
+    Parameter:
+    - data: data time-series (n x t)
+    - centroids: pusat cluster (c x t)
+    - use_pruning: pruning pada DTW (hasil jarak tetap sama)
+    - parallel: gunakan multi-thread OpenMP pada backend C
+    - window: lebar jendela Sakoe-Chiba, None berarti tanpa batas
+    - max_step: batas selisih maksimal per langkah, None berarti tanpa batas
+    Output:
+    - dist: matriks jarak DTW (c x n)
+    """
+    series = np.vstack([data, centroids]).astype(np.float64, copy=False)
+    return block_distance_matrix(
+        series,
+        len(data),
+        use_pruning=use_pruning,
+        parallel=parallel,
+        window=window,
+        max_step=max_step,
+    )
+
+
+def check_finite(series):
+    """
+    Backend C dtaidistance dapat menghentikan proses (SIGFPE) bila menerima
+    NaN/inf, sehingga series diperiksa lebih dulu.
+    """
+    if not np.all(np.isfinite(series)):
+        raise ValueError("Series atau centroid berisi NaN/inf, DTW tidak dihitung")
+
+
+def block_distance_matrix(
+    series, n, use_pruning=True, parallel=True, window=None, max_step=None
+):
+    """
+    Jarak DTW blok baris [0, n) x baris [n, akhir) dari satu array float64
+    (data di atas, centroid di bawah). Backend C dtaidistance hanya menerima
+    double, sehingga array ini disiapkan pemanggil (lihat DistanceCache).
+    Output:
+    - dist: matriks jarak DTW float64 (c x n)
+    """
+    check_finite(series)
+    c = len(series) - n
+
+    # Hanya blok data x centroid yang dihitung; bentuk compact agar memori
+    # O(n x c), bukan matriks penuh (n + c) x (n + c)
+    dm = dtw.distance_matrix_fast(
+        series,
+        block=((0, n), (n, n + c)),
+        compact=True,
+        use_pruning=use_pruning,
+        parallel=parallel,
+        window=window,
+        max_step=max_step,
+    )
+    return np.asarray(dm).reshape(n, c).T.copy()
+
+
+class DistanceCache:
+    """
+    Cache matriks jarak DTW untuk satu data dan satu set centroid.
+    Dipakai bersama oleh update membership, fungsi objektif, dan Xie-Beni
+    sehingga setiap pasangan (data, centroid) hanya dihitung sekali per iterasi.
+    Parameter:
+    - data: data time-series (n x t)
+    - use_pruning: pruning pada DTW (hasil jarak tetap sama)
+    - parallel: gunakan multi-thread OpenMP pada backend C
+    - window, max_step: batasan DTW, lihat compute_distance_matrix
+    Atribut:
+    - hits, misses: jumlah permintaan yang dilayani dari cache / dihitung ulang
+    - n_dtw: jumlah perhitungan jarak DTW yang benar-benar dilakukan
+    - dtype: tipe data jarak yang dikembalikan, mengikuti data (float32 atau
+      float64)
+
+    Data diubah ke float64 untuk backend C sekali saja ke dalam buffer
+    (n + c) x t; setiap iterasi hanya baris centroid yang ditulis ulang.
+    """
+
+    def __init__(
+        self, data, use_pruning=True, parallel=True, window=None, max_step=None
+    ):
+        self.data = as_float_array(data)
+        self.dtype = float_dtype(self.data)
+        self._series = None
+        self.use_pruning = use_pruning
+        self.parallel = parallel
+        self.window = window
+        self.max_step = max_step
+        self.hits = 0
+        self.misses = 0
+        self.n_dtw = 0
+        self._key = None
+        self._dist = None
+        self._key_centroid = None
+        self._dist_centroid = None
+        self._key_sparse = None
+        self._dist_sparse = None
+
+    @staticmethod
+    def _make_key(centroids):
+        centroids = np.ascontiguousarray(centroids, dtype=np.float64)
+        return centroids.shape, hashlib.blake2b(centroids.tobytes()).digest()
+
+    def _buffer(self, centroids):
+        """Buffer float64 berisi data lalu centroid untuk backend C"""
+        n = len(self.data)
+        c = len(centroids)
+        if self._series is None or len(self._series) != n + c:
+            self._series = np.empty((n + c, self.data.shape[1]))
+            self._series[:n] = self.data
+        self._series[n:] = centroids
+        return self._series
+
+    def get(self, centroids):
+        """Matriks jarak DTW data ke centroid (c x n)"""
+        key = self._make_key(centroids)
+        if key == self._key:
+            self.hits += 1
+            return self._dist
+
+        self.misses += 1
+        dist = block_distance_matrix(
+            self._buffer(centroids),
+            len(self.data),
+            use_pruning=self.use_pruning,
+            parallel=self.parallel,
+            window=self.window,
+            max_step=self.max_step,
+        )
+        self._dist = dist.astype(self.dtype, copy=False)
+        self._key = key
+        self.n_dtw += self._dist.size
+        return self._dist
+
+    def get_sparse(self, centroids, index):
+        """Matriks jarak DTW data ke k centroid kandidat (k x n)"""
+        index = np.ascontiguousarray(index)
+        key = self._make_key(centroids), hashlib.blake2b(index.tobytes()).digest()
+        if key == self._key_sparse:
+            self.hits += 1
+            return self._dist_sparse
+        if key[0] == self._key:
+            # Jarak penuh ke centroid yang sama sudah tersedia
+            self.hits += 1
+            return np.take_along_axis(self._dist, index, axis=0)
+
+        self.misses += 1
+        dist = compute_sparse_distances(
+            self._buffer(centroids)[: len(self.data)],
+            centroids,
+            index,
+            use_pruning=self.use_pruning,
+            parallel=self.parallel,
+            window=self.window,
+            max_step=self.max_step,
+        )
+        self._dist_sparse = dist.astype(self.dtype, copy=False)
+        self._key_sparse = key
+        self.n_dtw += self._dist_sparse.size
+        return self._dist_sparse
+
+    def get_centroid_distances(self, centroids):
+        """Matriks jarak DTW antar centroid (c x c)"""
+        key = self._make_key(centroids)
+        if key == self._key_centroid:
+            self.hits += 1
+            return self._dist_centroid
+
+        self.misses += 1
+        centroids = np.asarray(centroids, dtype=np.float64)
+        check_finite(centroids)
+        dist = dtw.distance_matrix_fast(
+            centroids,
+            use_pruning=self.use_pruning,
+            parallel=self.parallel,
+            window=self.window,
+            max_step=self.max_step,
+        )
+        self._dist_centroid = dist.astype(self.dtype, copy=False)
+        self._key_centroid = key
+        c = len(centroids)
+        self.n_dtw += c * (c - 1) // 2
+        return self._dist_centroid
+
+    def stats(self):
+        """Ringkasan penggunaan cache"""
+        return {"hits": self.hits, "misses": self.misses, "n_dtw": self.n_dtw}
+
+
+def make_cache(data, cache=None, window=None, max_step=None, parallel=True):
+    """
+    Membuat DistanceCache baru, atau memeriksa bahwa cache yang diberikan
+    memakai batasan DTW (window, max_step) yang sama.
+    """
+    if cache is None:
+        return DistanceCache(data, parallel=parallel, window=window, max_step=max_step)
+    if (cache.window, cache.max_step) != (window, max_step):
+        raise ValueError(
+            "Batasan DTW pada cache (window={}, max_step={}) berbeda dengan "
+            "parameter (window={}, max_step={})".format(
+                cache.window, cache.max_step, window, max_step
+            )
+        )
+    return cache
+
+
+def sakoe_chiba_window(persen, panjang):
+    """
+    Mengubah lebar pita Sakoe-Chiba dalam persen panjang series menjadi
+    parameter window dtaidistance. 100 persen atau lebih berarti tanpa batas.
+    """
+    if persen is None or persen >= 100:
+        return None
+    return max(1, int(round(panjang * persen / 100)))
+
+
+def get_distances(data, centroids, cache=None):
+    """
+    Fungsi mengambil matriks jarak DTW (c x n) dari cache bila tersedia,
+    bila tidak dihitung langsung.
+    """
+    if cache is not None:
+        return cache.get(centroids)
+    return compute_distance_matrix(data, centroids)
+
+
+def update_membership_dtw(data, centroids, m, cache=None):
     """
     Fungsi update membership menggunakan kesamaan jarak DTW (langkah 5).
     Parameter:
     - data: data time-series yang akan dihitung
     - centroids: pusat cluster
     - m: derajat fuzziness
+    - cache: DistanceCache yang dipakai bersama (opsional)
     Output:
     - u_new: centroid baru yang sudah diperbarui
     """
-    c = len(centroids)
-    n = len(data)
-    u_new = np.zeros((c, n))
-
-    for i in range(n):
-        for j in range(c):
-            denom = sum(
-                [
-                    (
-                        (
-                            dtw.distance_fast(data[i], centroids[j], use_pruning=True)
-                            + 1e-6
-                        )
-                        / (
-                            dtw.distance_fast(data[i], centroids[k], use_pruning=True)
-                            + 1e-6
-                        )
-                    )
-                    ** (2 / (m - 1))
-                    for k in range(c)
-                ]
-            )
-            u_new[j, i] = 1 / denom
+    dist = get_distances(data, centroids, cache)
+    return membership_from_distances(dist, m)
+
+
+def membership_from_distances(dist, m):
+    """
+    Matriks keanggotaan dari matriks jarak DTW (c x n) yang sudah dihitung.
+    Jarak inf (centroid tidak terjangkau karena max_step) diberi keanggotaan
+    nol; ValueError bila ada data yang tidak terjangkau dari semua centroid.
+    """
+    dist = dist + 1e-6
+    tak_terjangkau = ~np.isfinite(dist)
+    if np.any(np.all(tak_terjangkau, axis=0)):
+        raise ValueError(
+            "Ada data yang tidak terjangkau DTW dari semua centroid, "
+            "max_step terlalu kecil"
+        )
+
+    # Rasio jarak d_ji / d_ki untuk semua pasangan cluster: (c x c x n)
+    with np.errstate(invalid="ignore"):
+        ratio = (dist[:, np.newaxis, :] / dist[np.newaxis, :, :]) ** (2 / (m - 1))
+        u_new = 1 / np.sum(ratio, axis=1)
+    if np.any(tak_terjangkau):
+        u_new[tak_terjangkau] = 0
     return u_new
 
 
-def compute_objective_function(u, centroids, data, m):
+def compute_objective_function(u, centroids, data, m, cache=None):
     """
     Fungsi objektif Fuzzy C-Means dengan DTW sebagai metrik jarak (langkah 3)
 
     Parameter:
-    - u: matriks keanggotaan (c x n)
+    - u: matriks keanggotaan (c x n) atau SparseMembership
     - centroids: array (c x t)
     - data: array (n x t)
     - m: derajat fuzziness
+    - cache: DistanceCache yang dipakai bersama (opsional)
     Return:
     - jm: nilai fungsi objektif
     """
-    c, n = u.shape
-    jm = 0.0
-    for i in range(c):
-        for k in range(n):
-            dist = dtw.distance_fast(data[k], centroids[i])
-            jm += (u[i][k] ** m) * (dist**2)
+    if isinstance(u, SparseMembership):
+        if cache is not None:
+            dist = cache.get_sparse(centroids, u.index)
+        else:
+            dist = compute_sparse_distances(data, centroids, u.index)
+        return np.sum(compactness_terms(u.value, dist, m), dtype=np.float64)
+    dist = get_distances(data, centroids, cache)
+    jm = np.sum(compactness_terms(u, dist, m), dtype=np.float64)
     return jm
 
 
-def fcm_with_dtw_model(data, c, m, error, maxiter):
+class SparseMembership:
+    """
+    Matriks keanggotaan jarang: hanya k keanggotaan terbesar setiap data yang
+    disimpan, sisanya dianggap nol. Memori O(n x k), bukan O(n x c).
+    Parameter:
+    - index: nomor cluster (k x n), berbeda untuk setiap kolom
+    - value: derajat keanggotaan (k x n), setiap kolom berjumlah 1
+    - c: jumlah cluster
+    """
+
+    def __init__(self, index, value, c):
+        self.index = np.asarray(index, dtype=np.intp)
+        self.value = as_float_array(value)
+        self.c = c
+
+    @property
+    def shape(self):
+        """Ukuran matriks penuh (c x n)"""
+        return self.c, self.value.shape[1]
+
+    @property
+    def k(self):
+        return self.value.shape[0]
+
+    def toarray(self):
+        """Matriks keanggotaan penuh (c x n)"""
+        u = np.zeros(self.shape)
+        np.put_along_axis(u, self.index, self.value, axis=0)
+        return u
+
+    def argmax(self):
+        """Cluster dengan keanggotaan terbesar setiap data"""
+        terbesar = np.argmax(self.value, axis=0)
+        return self.index[terbesar, np.arange(self.value.shape[1])]
+
+
+def sparsify_membership(u, k):
+    """
+    Menyimpan k keanggotaan terbesar setiap data lalu menormalkan ulang
+    sehingga setiap kolom berjumlah 1.
+    """
+    index = np.argsort(-u, axis=0, kind="stable")[:k]
+    value = np.take_along_axis(u, index, axis=0)
+    value = value / np.sum(value, axis=0, keepdims=True)
+    return SparseMembership(index, value, u.shape[0])
+
+
+def membership_values(u):
+    """Nilai keanggotaan yang tidak nol (matriks penuh atau SparseMembership)"""
+    if isinstance(u, SparseMembership):
+        return u.value
+    return u
+
+
+def membership_change(u, u_old):
+    """Norma perubahan matriks keanggotaan (penuh atau SparseMembership)"""
+    if isinstance(u, SparseMembership) and isinstance(u_old, SparseMembership):
+        if np.array_equal(u.index, u_old.index):
+            return float(np.linalg.norm(u.value - u_old.value))
+    if isinstance(u, SparseMembership):
+        u = u.toarray()
+    if isinstance(u_old, SparseMembership):
+        u_old = u_old.toarray()
+    return float(np.linalg.norm(u - u_old))
+
+
+def membership_max_change(u, u_old):
+    """Perubahan keanggotaan terbesar (norma maksimum) antara dua iterasi"""
+    if isinstance(u, SparseMembership) and isinstance(u_old, SparseMembership):
+        if np.array_equal(u.index, u_old.index):
+            return float(np.max(np.abs(u.value - u_old.value)))
+    if isinstance(u, SparseMembership):
+        u = u.toarray()
+    if isinstance(u_old, SparseMembership):
+        u_old = u_old.toarray()
+    return float(np.max(np.abs(u - u_old)))
+
+
+def compute_sparse_distances(
+    data, centroids, index, use_pruning=True, parallel=True, window=None, max_step=None
+):
+    """
+    Jarak DTW setiap data hanya ke k centroid pada index (k x n). Data
+    dikelompokkan per centroid sehingga setiap centroid cukup satu panggilan
+    backend C; jumlah DTW n x k.
+    Output:
+    - dist: matriks jarak DTW (k x n), sejajar dengan index
+    """
+    data = np.asarray(data, dtype=np.float64)
+    centroids = np.asarray(centroids, dtype=np.float64)
+    dist = np.empty(index.shape)
+    for j in range(len(centroids)):
+        baris, kolom = np.nonzero(index == j)
+        if len(kolom) == 0:
+            continue
+        dist[baris, kolom] = compute_distance_matrix(
+            data[kolom],
+            centroids[j : j + 1],
+            use_pruning=use_pruning,
+            parallel=parallel,
+            window=window,
+            max_step=max_step,
+        )[0]
+    return dist
+
+
+def update_membership_sparse(data, centroids, m, index, cache=None):
+    """
+    Update membership hanya terhadap k centroid kandidat setiap data (index).
+    Rumus sama dengan update_membership_dtw dengan penjumlahan dibatasi pada
+    kandidat, sehingga setiap kolom tetap berjumlah 1.
+    Output:
+    - u_new: SparseMembership
+    """
+    if cache is not None:
+        dist = cache.get_sparse(centroids, index)
+    else:
+        dist = compute_sparse_distances(data, centroids, index)
+    return SparseMembership(index, membership_from_distances(dist, m), len(centroids))
+
+
+def resize_centroids(centroids, panjang):
+    """
+    Menyesuaikan panjang centroid dengan panjang series saat ini. Bila series
+    bertambah, nilai terakhir diulang; bila berkurang, diambil bagian akhir.
+    """
+    centroids = np.asarray(centroids, dtype=np.float64)
+    selisih = panjang - centroids.shape[1]
+    if selisih > 0:
+        return np.pad(centroids, ((0, 0), (0, selisih)), mode="edge")
+    return centroids[:, centroids.shape[1] - panjang :]
+
+
+# ===================== KRITERIA BERHENTI DAN AKSELERASI =========================
+# Kriteria berhenti: "objective" |J - J_lama| < error (default),
+# "relative" |J - J_lama| < error * |J_lama|, "membership" max |u - u_lama| < error
+STOP_RULES = ("objective", "relative", "membership")
+
+
+def is_converged(stop_rule, error, jm, jm_old, max_delta_u):
+    """Memeriksa kriteria berhenti stop_rule (lihat STOP_RULES)"""
+    if stop_rule == "objective":
+        return abs(jm - jm_old) < error
+    if stop_rule == "relative":
+        return abs(jm - jm_old) < error * abs(jm_old)
+    if stop_rule == "membership":
+        return max_delta_u < error
+    raise ValueError(f"stop_rule harus salah satu dari {STOP_RULES}")
+
+
+def project_fuzzy_partition(u):
+    """
+    Proyeksi Euclid setiap kolom u ke simpleks probabilitas sehingga
+    keanggotaan berada di [0, 1] dan berjumlah 1 untuk setiap data.
+    """
+    c, n = u.shape
+    urut = -np.sort(-u, axis=0)
+    kumulatif = np.cumsum(urut, axis=0) - 1
+    k = np.arange(1, c + 1)[:, np.newaxis]
+    # Indeks terakhir dengan urut - kumulatif / k > 0 untuk setiap kolom
+    rho = c - 1 - np.argmax((urut - kumulatif / k > 0)[::-1], axis=0)
+    theta = kumulatif[rho, np.arange(n)] / (rho + 1)
+    return np.maximum(u - theta, 0).astype(u.dtype, copy=False)
+
+
+class MembershipAccelerator:
+    """
+    Over-relaxation update keanggotaan FCM: u_baru = u + omega (T(u) - u),
+    dengan T(u) update FCM biasa, untuk mengurangi jumlah iterasi (dan
+    perhitungan DTW) sampai konvergen.
+    Parameter:
+    - omega: faktor over-relaxation (1 berarti tanpa akselerasi)
+
+    Hasil ekstrapolasi diproyeksikan ke partisi fuzzy yang valid. Langkah
+    ekstrapolasi ditolak oleh fcm_with_dtw_model bila fungsi objektif dan
+    residual ||T(u) - u|| sama-sama naik; iterasi kembali ke hasil update
+    biasa dan omega diperkecil (backoff).
+    """
+
+    def __init__(self, omega=1.5):
+        self.omega = omega
+
+    def backoff(self):
+        """Dipanggil bila langkah ekstrapolasi ditolak"""
+        self.omega = 1 + (self.omega - 1) / 2
+
+    def step(self, u, u_new):
+        """
+        Usulan keanggotaan iterasi berikutnya dari u dan T(u), atau None bila
+        tidak ada ekstrapolasi yang valid (pakai T(u) biasa).
+        """
+        usulan = u_new + (self.omega - 1) * (u_new - u)
+        usulan = project_fuzzy_partition(usulan)
+        # Setiap cluster harus tetap punya bobot agar centroid terdefinisi
+        if not np.all(np.isfinite(usulan)) or np.any(usulan.sum(axis=1) <= 0):
+            return None
+        return usulan
+
+
+ACCELERATE = ("relax",)
+
+
+def make_accelerator(accelerate):
+    """MembershipAccelerator dari nama metode, objek yang sudah ada, atau None"""
+    if accelerate is None or isinstance(accelerate, MembershipAccelerator):
+        return accelerate
+    if accelerate not in ACCELERATE:
+        raise ValueError(f"accelerate harus salah satu dari {ACCELERATE}")
+    return MembershipAccelerator()
+
+
+def fcm_with_dtw_model(
+    data,
+    c,
+    m,
+    error,
+    maxiter,
+    cache=None,
+    random_state=None,
+    progress=True,
+    return_info=False,
+    window=None,
+    max_step=None,
+    init_u=None,
+    init_centroids=None,
+    callback=None,
+    top_k=None,
+    warmup=5,
+    refresh=None,
+    stop_rule="objective",
+    accelerate=None,
+):
+    """
+    Melatih Fuzzy C-Means dengan jarak DTW.
+    Parameter:
+    - data, c, m, error, maxiter: lihat fcm_model
+    - cache: DistanceCache yang dipakai bersama (opsional)
+    - window, max_step: batasan DTW, dipakai pada setiap perhitungan jarak
+    - random_state: seed inisiasi matriks keanggotaan
+    - progress: tampilkan progress bar tqdm
+    - return_info: kembalikan juga dict info pelatihan
+    - init_u: matriks keanggotaan awal (c x n) dari model sebelumnya
+    - init_centroids: centroid awal (c x t) dari model sebelumnya, dipakai bila
+      init_u tidak diberikan atau ukurannya tidak cocok
+    - callback: fungsi yang dipanggil setiap akhir iterasi dengan dict catatan
+      iterasi (lihat trace)
+    - top_k: mode jarang; setelah warmup iterasi penuh hanya k keanggotaan
+      terbesar setiap data yang disimpan dan jarak DTW hanya dihitung ke k
+      centroid tersebut (u berupa SparseMembership). None berarti penuh.
+    - warmup: jumlah iterasi penuh sebelum mode jarang
+    - refresh: pada mode jarang, setiap refresh iterasi dilakukan satu
+      iterasi penuh untuk memilih ulang centroid kandidat; None berarti hanya
+      setelah ada cluster yang keluar dari kandidat semua data (centroidnya
+      diinisiasi ulang, lihat compute_centroids)
+    - stop_rule: kriteria berhenti dengan ambang error, lihat STOP_RULES
+    - accelerate: None, "relax", atau MembershipAccelerator (omega lain);
+      hanya untuk keanggotaan penuh (tidak pada mode jarang)
+    Output:
+    - centroids, u (dan info berisi "objective", "n_iter", "warm_start",
+      "stop_reason", dan "trace" bila return_info)
+
+    Catatan iterasi pada trace berisi "iteration", "t_centroid",
+    "t_membership", "t_objective" (detik), "n_dtw" (jumlah perhitungan DTW
+    baru), "objective", "delta_u" (norma perubahan matriks keanggotaan),
+    "max_delta_u" (perubahan keanggotaan terbesar), dan "step" ("biasa",
+    "ekstrapolasi", atau "ditolak" bila objektif naik setelah ekstrapolasi).
+    stop_reason bernilai "tolerance" bila kriteria stop_rule terpenuhi,
+    atau "maxiter" bila iterasi maksimum tercapai.
+    """
+    if stop_rule not in STOP_RULES:
+        raise ValueError(f"stop_rule harus salah satu dari {STOP_RULES}")
+    accelerator = make_accelerator(accelerate)
+    # float32 bila data float32: centroid dan keanggotaan ikut float32
+    data = as_float_array(data)
+    dtype = float_dtype(data)
     n_sampels = len(data)
 
-    #  2) Inisiasi matriks acak U
-    u = initialize_membership(n_sampels, c)
+    cache = make_cache(data, cache, window=window, max_step=max_step)
+
+    #  2) Inisiasi matriks U, dari model sebelumnya bila ada
+    warm_start = True
+    if isinstance(init_u, SparseMembership) and init_u.shape == (c, n_sampels):
+        # Tetap jarang hanya bila mode jarang diminta
+        if top_k is not None and top_k < c:
+            u = init_u
+        else:
+            u = init_u.toarray().astype(dtype, copy=False)
+    elif init_u is not None and np.shape(init_u) == (c, n_sampels):
+        u = np.asarray(init_u, dtype=dtype)
+        u = u / np.sum(u, axis=0, keepdims=True)
+    elif init_centroids is not None and len(init_centroids) == c:
+        init_centroids = resize_centroids(init_centroids, np.shape(data)[1])
+        u = update_membership_dtw(data, init_centroids.astype(dtype), m, cache=cache)
+    else:
+        warm_start = False
+        u = initialize_membership(n_sampels, c, random_state=random_state, dtype=dtype)
 
     jm_old = np.inf
-    for iteration in tqdm(range(maxiter)):
+    if warm_start:
+        # Fungsi objektif awal; jaraknya dipakai ulang iterasi pertama (cache)
+        centroids = compute_centroids(data, u, m)
+        jm_old = compute_objective_function(u, centroids, data, m, cache=cache)
+
+    trace = []
+    stop_reason = "maxiter"
+    u_fallback = None  # hasil update biasa sebelum ekstrapolasi
+    delta_old = np.inf
+    n_sparse = 0  # iterasi jarang sejak iterasi penuh terakhir
+    segarkan = False  # iterasi berikutnya penuh untuk memilih ulang kandidat
+    for iteration in progress_range(maxiter, progress):
+        u_old = u
+        n_dtw = cache.n_dtw
 
         # 3) Menghitung jarak ke centroid
+        start = time.perf_counter()
         centroids = compute_centroids(data, u, m)
-
-        # 4) Memperbarui elemen matriks
-        u = update_membership_dtw(data, centroids, m)
+        t_centroid = time.perf_counter() - start
+
+        # 4) Memperbarui elemen matriks; mode jarang hanya ke centroid kandidat
+        start = time.perf_counter()
+        sparse = isinstance(u, SparseMembership)
+        if sparse and not segarkan and (refresh is None or n_sparse < refresh):
+            u = update_membership_sparse(data, centroids, m, u.index, cache=cache)
+            n_sparse += 1
+        else:
+            # Iterasi penuh, pada mode jarang sekaligus memilih ulang kandidat
+            u = update_membership_dtw(data, centroids, m, cache=cache)
+            n_sparse = 0
+            k = u_old.k if sparse else top_k
+            if k is not None and k < c and (sparse or iteration + 1 >= warmup):
+                u = sparsify_membership(u, k)
+            # Cluster yang keluar dari kandidat semua data diinisiasi ulang
+            # (compute_centroids) lalu kandidatnya dipilih ulang secara penuh
+            segarkan = isinstance(u, SparseMembership) and np.any(
+                cluster_weights(u) == 0
+            )
+        t_membership = time.perf_counter() - start
 
         # 5) Menghitung dan memperbarui fungsi objektif
-        jm = compute_objective_function(u, centroids, data, m)
+        start = time.perf_counter()
+        jm = compute_objective_function(u, centroids, data, m, cache=cache)
+        t_objective = time.perf_counter() - start
+
+        record = {
+            "iteration": iteration + 1,
+            "t_centroid": t_centroid,
+            "t_membership": t_membership,
+            "t_objective": t_objective,
+            "n_dtw": cache.n_dtw - n_dtw,
+            "objective": jm,
+            "delta_u": membership_change(u, u_old),
+            "max_delta_u": membership_max_change(u, u_old),
+            "step": "biasa" if u_fallback is None else "ekstrapolasi",
+        }
+
+        # Pengaman: objektif dan residual naik setelah ekstrapolasi, kembali
+        # ke hasil update biasa iterasi sebelumnya. Objektif FCM-DTW sendiri
+        # tidak selalu turun, sehingga kenaikan objektif saja tidak cukup.
+        if u_fallback is not None and jm > jm_old and record["delta_u"] > delta_old:
+            record["step"] = "ditolak"
+            trace.append(record)
+            if callback is not None:
+                callback(record)
+            u, u_fallback = u_fallback, None
+            accelerator.backoff()
+            continue
+
+        trace.append(record)
+        if callback is not None:
+            callback(record)
+        # Hasil terakhir yang diterima: keanggotaan sesuai dengan centroids
+        centroids_fit, u_fit, jm_fit = centroids, u, jm
 
         # Eary Stopping
-        # if np.linalg.norm(u - u_old) < error:
-        #     break
-        if abs(jm-jm_old)<error:
+        if is_converged(stop_rule, error, jm, jm_old, record["max_delta_u"]):
+            stop_reason = "tolerance"
             break
 
-        jm_old=jm
-
+        jm_old = jm
+        delta_old = record["delta_u"]
+
+        # Ekstrapolasi hanya untuk keanggotaan penuh
+        u_fallback = None
+        if accelerator is not None and not (
+            isinstance(u, SparseMembership) or isinstance(u_old, SparseMembership)
+        ):
+            usulan = accelerator.step(u_old, u)
+            if usulan is not None:
+                u, u_fallback = usulan, u
+
+    centroids, u, jm = centroids_fit, u_fit, jm_fit
+
+    if return_info:
+        info = {
+            "objective": jm,
+            "n_iter": iteration + 1,
+            "warm_start": warm_start,
+            "stop_reason": stop_reason,
+            "trace": pd.DataFrame(trace),
+        }
+        return centroids, u, info
     return centroids, u
 
 
+def _fit_restart(
+    data,
+    c,
+    m,
+    error,
+    maxiter,
+    seed,
+    window,
+    max_step,
+    top_k,
+    warmup,
+    refresh,
+    stop_rule,
+    accelerate,
+):
+    """Satu kali restart fcm_with_dtw_model untuk dijalankan di process pool"""
+    # Paralelisme sudah di level proses, DTW dijalankan satu thread
+    cache = make_cache(data, window=window, max_step=max_step, parallel=False)
+    centroids, u, info = fcm_with_dtw_model(
+        data,
+        c,
+        m,
+        error,
+        maxiter,
+        cache=cache,
+        random_state=seed,
+        progress=False,
+        return_info=True,
+        window=window,
+        max_step=max_step,
+        top_k=top_k,
+        warmup=warmup,
+        refresh=refresh,
+        stop_rule=stop_rule,
+        accelerate=accelerate,
+    )
+    return centroids, u, info
+
+
+def fcm_multistart(
+    data,
+    c,
+    m,
+    error,
+    maxiter,
+    n_init=4,
+    random_state=None,
+    n_jobs=None,
+    window=None,
+    max_step=None,
+    top_k=None,
+    warmup=5,
+    refresh=None,
+    stop_rule="objective",
+    accelerate=None,
+):
+    """
+    Melatih FCM beberapa kali dengan seed berbeda secara paralel (process pool)
+    dan memilih hasil dengan fungsi objektif terkecil.
+    Parameter:
+    - data, c, m, error, maxiter: lihat fcm_model
+    - n_init: jumlah restart
+    - random_state: seed induk, seed setiap restart diturunkan darinya
+    - n_jobs: jumlah proses, None memakai jumlah CPU
+    - window, max_step: batasan DTW
+    - top_k, warmup, refresh: mode keanggotaan jarang, lihat
+      fcm_with_dtw_model
+    - stop_rule, accelerate: kriteria berhenti dan akselerasi, lihat
+      fcm_with_dtw_model
+    Output:
+    - centroids, u: hasil restart terbaik
+    - df_restart: DataFrame seed, fungsi objektif, iterasi, dan alasan berhenti
+      setiap restart
+    """
+    seeds = np.random.SeedSequence(random_state).generate_state(n_init)
+    seeds = [int(seed) for seed in seeds]
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(
+                _fit_restart,
+                data,
+                c,
+                m,
+                error,
+                maxiter,
+                seed,
+                window,
+                max_step,
+                top_k,
+                warmup,
+                refresh,
+                stop_rule,
+                accelerate,
+            )
+            for seed in seeds
+        ]
+        results = [future.result() for future in futures]
+
+    objectives = [info["objective"] for _, _, info in results]
+    best = int(np.argmin(objectives))
+
+    df_restart = pd.DataFrame(
+        {
+            "Restart": np.arange(1, n_init + 1),
+            "Seed": seeds,
+            "Fungsi Objektif": objectives,
+            "Iterasi": [info["n_iter"] for _, _, info in results],
+            "Berhenti": [info["stop_reason"] for _, _, info in results],
+            "Terbaik": np.arange(n_init) == best,
+        }
+    )
+
+    centroids, u, _ = results[best]
+    return centroids, u, df_restart
+
+
 # ===================== EVALUASI KLASTER =========================
 
 
@@ -239,10 +1090,8 @@ def compute_mpc(u):
     Modified Partition Coefficient (MPC)
     Nilai ideal: mendekati 1, maksimal = 1
     """
-    n = u.shape[1]  # jumlah data
-    c = u.shape[0]  # jumlah cluster
-    MPC = 1 - (c / (c - 1)) * (1 - (np.sum(u**2) / n))
-    return MPC
+    # keanggotaan nol tidak menambah jumlah
+    return modified_partition_coefficient(membership_values(u), u.shape[0])
 
 
 def compute_pc(u):
@@ -250,9 +1099,7 @@ def compute_pc(u):
     Partition Coefficient (PC) atau Fuzzy Partition Coefficient (FPC)
     Nilai ideal: mendekati 1
     """
-    n = u.shape[1]  # jumlah data
-    PC = np.sum(u**2) / n
-    return PC
+    return partition_coefficient(membership_values(u))
 
 
 def compute_pe(u):
@@ -260,42 +1107,170 @@ def compute_pe(u):
     Partition Entropy (PE)
     Nilai ideal: mendekati 0 (semakin jelas)
     """
-    n = u.shape[1]  # jumlah data
-    PE = -np.sum(u * np.log(u + 1e-10)) / n
-    return PE
+    return partition_entropy(membership_values(u))
+
+
+def cluster_weights(u):
+    """Total keanggotaan setiap cluster (c,), penuh atau SparseMembership"""
+    if isinstance(u, SparseMembership):
+        return np.bincount(u.index.ravel(), weights=u.value.ravel(), minlength=u.c)
+    return np.sum(u, axis=1, dtype=np.float64)
 
 
-def compute_xb(data, centroids, u, m):
+def drop_empty_clusters(u, centroids):
+    """
+    Membuang cluster tanpa anggota (total keanggotaan nol) beserta centroidnya
+    sebelum evaluasi. Centroid cluster kosong tidak bermakna (dapat berisi
+    NaN), sehingga tidak ikut dihitung jarak DTW-nya maupun jarak antar
+    centroid; indeks berbasis keanggotaan tidak berubah karena nilainya nol.
+    Output:
+    - u, centroids tanpa cluster kosong
+    """
+    ada = cluster_weights(u) > 0
+    if np.all(ada):
+        return u, centroids
+    centroids = np.asarray(centroids)[ada]
+    if isinstance(u, SparseMembership):
+        # Kandidat ke cluster kosong bernilai nol, diarahkan ke cluster 0 agar
+        # indeks tetap valid; bobotnya nol sehingga tidak menambah jumlah
+        nomor = np.cumsum(ada) - 1
+        index = np.where(ada[u.index], nomor[u.index], 0)
+        return SparseMembership(index, u.value, int(np.sum(ada))), centroids
+    return u[ada], centroids
+
+
+def _validity_distances(data, centroids, u, cache):
+    """Jarak data ke centroid (bentuk sama seperti u) dan antar centroid"""
+    if isinstance(u, SparseMembership):
+        # Hanya pasangan data-centroid kandidat yang keanggotaannya tidak nol
+        dist = cache.get_sparse(centroids, u.index)
+    else:
+        dist = cache.get(centroids)
+    return dist, cache.get_centroid_distances(centroids)
+
+
+def compute_xb(data, centroids, u, m, cache=None, window=None, max_step=None):
     """
     Menghitung Xie-Beni Index menggunakan DTW.
     - data: list atau array shape (n_samples, time_steps)
     - centroids: list atau array shape (n_clusters, time_steps)
-    - u: matriks keanggotaan shape (n_clusters, n_samples)
+    - u: matriks keanggotaan shape (n_clusters, n_samples) atau
+      SparseMembership
+    - cache: DistanceCache yang dipakai bersama (opsional)
+    - window, max_step: batasan DTW
+    """
+    cache = make_cache(data, cache, window=window, max_step=max_step)
+    dist, dist_centroid = _validity_distances(data, centroids, u, cache)
+    return xie_beni(membership_values(u), dist, dist_centroid, m)
+
+
+def compute_validity(
+    data,
+    centroids,
+    u,
+    m,
+    cache=None,
+    window=None,
+    max_step=None,
+    indices=INDEKS_DEFAULT,
+):
+    """
+    Menghitung beberapa indeks validitas sekaligus (lihat validity.INDEKS).
+    Jarak DTW diambil dari cache (backend C paralel) dan hanya dihitung bila
+    ada indeks berbasis jarak. Cluster kosong tidak ikut dievaluasi (lihat
+    drop_empty_clusters), MPC tetap memakai jumlah cluster semula.
+    Output:
+    - dict nama indeks -> nilai
     """
-    n_samples = u.shape[1]
     c = u.shape[0]
+    u, centroids = drop_empty_clusters(u, centroids)
+    dist = dist_centroid = index = None
+    if needs_distance(indices):
+        cache = make_cache(data, cache, window=window, max_step=max_step)
+        dist, dist_centroid = _validity_distances(data, centroids, u, cache)
+    if isinstance(u, SparseMembership):
+        index = u.index
+    return compute_indices(
+        membership_values(u),
+        m,
+        c=c,
+        dist=dist,
+        dist_centroid=dist_centroid,
+        index=index,
+        names=indices,
+    )
+
+
+def evaluate_batch(
+    data,
+    results,
+    m,
+    indices=INDEKS_DEFAULT,
+    window=None,
+    max_step=None,
+    parallel=True,
+):
+    """
+    Mengevaluasi banyak hasil FCM pada data yang sama sekaligus. Jarak semua
+    data ke semua centroid dihitung dalam satu panggilan backend C
+    (paralel), begitu pula jarak antar centroid.
+    Parameter:
+    - data: array (n x t)
+    - results: list (u, centroids); u matriks penuh atau SparseMembership
+    - m: derajat fuzziness, satu nilai atau list sepanjang results
+    - indices: nama indeks, lihat validity.INDEKS
+    - window, max_step: batasan DTW
+    Output:
+    - df_evaluasi: DataFrame "Jumlah klaster" dan indeks setiap hasil
 
-    numerator = 0.0
-    for i in range(n_samples):  # data
-        x_i = np.array(data[i], dtype=np.float64)  # pastikan bertipe float
-        for j in range(c):  # centroid
-            v_j = np.array(centroids[j], dtype=np.float64)
-            dist = dtw.distance(x_i, v_j)
-            numerator += (u[j, i] ** m) * (dist**2)
-
-    # Cari jarak minimum antar centroid
-    min_dist = np.inf
-    for j in range(c):
-        for k in range(j + 1, c):
-            v_j = np.array(centroids[j], dtype=np.float64)
-            v_k = np.array(centroids[k], dtype=np.float64)
-            dist = dtw.distance(v_j, v_k)
-            if dist < min_dist:
-                min_dist = dist
-
-    denominator = n_samples * (min_dist**2)
-    xb_index = numerator / denominator
-    return xb_index
+    Cluster kosong setiap hasil dibuang sebelum evaluasi, lihat
+    drop_empty_clusters.
+    """
+    m_values = m if isinstance(m, (list, tuple)) else [m] * len(results)
+    data = np.asarray(data, dtype=np.float64)
+    n_clusters = [u.shape[0] for u, _ in results]
+    results = [drop_empty_clusters(u, centroids) for u, centroids in results]
+    sizes = [len(centroids) for _, centroids in results]
+    batas = np.cumsum([0] + sizes)
+
+    dist_all = dist_centroid_all = None
+    if needs_distance(indices):
+        centroids_all = np.vstack([centroids for _, centroids in results])
+        centroids_all = centroids_all.astype(np.float64)
+        check_finite(centroids_all)
+        dist_all = block_distance_matrix(
+            np.vstack([data, centroids_all]),
+            len(data),
+            parallel=parallel,
+            window=window,
+            max_step=max_step,
+        )
+        dist_centroid_all = dtw.distance_matrix_fast(
+            centroids_all, parallel=parallel, window=window, max_step=max_step
+        )
+
+    rows = []
+    for (u, _), c, m_i, lo, hi in zip(
+        results, n_clusters, m_values, batas[:-1], batas[1:]
+    ):
+        dist = dist_centroid = index = None
+        if dist_all is not None:
+            dist = dist_all[lo:hi]
+            dist_centroid = dist_centroid_all[lo:hi, lo:hi]
+            if isinstance(u, SparseMembership):
+                index = u.index
+                dist = np.take_along_axis(dist, index, axis=0)
+        nilai = compute_indices(
+            membership_values(u),
+            m_i,
+            c=c,
+            dist=dist,
+            dist_centroid=dist_centroid,
+            index=index,
+            names=indices,
+        )
+        rows.append({"Jumlah klaster": c, **nilai})
+    return pd.DataFrame(rows)
 
 
 # ===================== IMPLEMENTASI MODEL FCM =========================
@@ -306,6 +1281,22 @@ def fcm_model(
     error,
     maxiter,
     columns_name=komoditas,
+    cache=None,
+    n_init=1,
+    random_state=None,
+    n_jobs=None,
+    return_info=False,
+    progress=True,
+    window=None,
+    max_step=None,
+    warm_start=None,
+    callback=None,
+    top_k=None,
+    warmup=5,
+    refresh=None,
+    indices=INDEKS_DEFAULT,
+    stop_rule="objective",
+    accelerate=None,
 ):
     """
     Implementasi dalam melatih model Fuzzy C-Means pada satu set data dan satu kali pelatihan.
@@ -316,29 +1307,121 @@ def fcm_model(
     - m: derajat fuzziness
     - error: toleransi error
     - maxiter: maksimal iterasi
+    - cache: DistanceCache untuk dipakai bersama dan membaca statistik hit/miss
+    - n_init: jumlah restart paralel, hasil dengan fungsi objektif terkecil dipilih
+    - random_state: seed agar hasil dapat direproduksi
+    - n_jobs: jumlah proses untuk restart paralel
+    - return_info: kembalikan juga dict info pelatihan
+    - progress: tampilkan progress bar tqdm
+    - window: lebar jendela Sakoe-Chiba DTW, None berarti tanpa batas
+    - max_step: batas selisih maksimal per langkah DTW
+    - warm_start: info dari fcm_model sebelumnya (return_info=True); pelatihan
+      dimulai dari keanggotaan/centroid hasil model tersebut tanpa restart
+    - callback: dipanggil setiap iterasi dengan catatan iterasi (lihat
+      fcm_with_dtw_model); hanya untuk pelatihan tanpa restart paralel
+    - top_k: simpan hanya k keanggotaan terbesar setiap data setelah warmup
+      iterasi (lihat fcm_with_dtw_model); evaluasi dihitung dari bentuk jarang
+    - warmup, refresh: iterasi penuh sebelum dan selama mode jarang, lihat
+      fcm_with_dtw_model
+    - indices: indeks validitas pada df_evaluasi (lihat validity.INDEKS),
+      default MPC, PE, XB
+    - stop_rule: kriteria berhenti "objective", "relative", atau "membership"
+    - accelerate: "relax" untuk over-relaxation update keanggotaan (lihat
+      MembershipAccelerator), None berarti tanpa akselerasi
 
     Return/Output:
     - df_evaluasi = DataFrame evaluasi klaster
     - df_results = DataFrame berisi keanggotaan klaster
+    - info = dict info pelatihan (hanya bila return_info), berisi
+      "restarts" (DataFrame seed dan fungsi objektif tiap restart),
+      "centroids", "u", "n_iter", "iterations_saved" (selisih iterasi
+      terhadap pelatihan tanpa warm start yang menjadi acuan; 0 bila warm
+      start tidak dipakai, mis. karena c berbeda), "stop_reason",
+      dan "trace" (DataFrame catatan per iterasi, None untuk restart paralel)
     """
 
     result_eval = []
 
-    # Training FCM
-    cntr, u = fcm_with_dtw_model(data=data, c=c, m=m, error=error, maxiter=maxiter)
-
-    mpc_value = compute_mpc(u)
-    pe_value = compute_pe(u)
-    xb_value = compute_xb(data, cntr, u, m=m)
+    cache = make_cache(data, cache, window=window, max_step=max_step)
 
-    result_eval.append(
-        {"Jumlah klaster": c, "MPC": mpc_value, "PE": pe_value, "XB": xb_value}
+    # Training FCM
+    warm_used = False
+    if n_init > 1 and warm_start is None:
+        cntr, u, df_restart = fcm_multistart(
+            data,
+            c=c,
+            m=m,
+            error=error,
+            maxiter=maxiter,
+            n_init=n_init,
+            random_state=random_state,
+            n_jobs=n_jobs,
+            window=window,
+            max_step=max_step,
+            top_k=top_k,
+            warmup=warmup,
+            refresh=refresh,
+            stop_rule=stop_rule,
+            accelerate=accelerate,
+        )
+        trace = None
+    else:
+        cntr, u, info_fit = fcm_with_dtw_model(
+            data=data,
+            c=c,
+            m=m,
+            error=error,
+            maxiter=maxiter,
+            cache=cache,
+            random_state=random_state,
+            progress=progress,
+            return_info=True,
+            window=window,
+            max_step=max_step,
+            init_u=None if warm_start is None else warm_start["u"],
+            init_centroids=None if warm_start is None else warm_start["centroids"],
+            callback=callback,
+            top_k=top_k,
+            warmup=warmup,
+            refresh=refresh,
+            stop_rule=stop_rule,
+            accelerate=accelerate,
+        )
+        trace = info_fit["trace"]
+        warm_used = info_fit["warm_start"]
+        df_restart = pd.DataFrame(
+            {
+                "Restart": [1],
+                "Seed": [random_state],
+                "Fungsi Objektif": [info_fit["objective"]],
+                "Iterasi": [info_fit["n_iter"]],
+                "Berhenti": [info_fit["stop_reason"]],
+                "Terbaik": [True],
+            }
+        )
+
+    nilai = compute_validity(
+        data,
+        cntr,
+        u,
+        m,
+        cache=cache,
+        window=window,
+        max_step=max_step,
+        indices=indices,
     )
 
+    result_eval.append({"Jumlah klaster": c, **nilai})
+
     df_evaluasi_cluster = pd.DataFrame(result_eval)
 
     # Defuzzifikasi
-    cluster_membership = np.argmax(u, axis=0) + 1
+    if isinstance(u, SparseMembership):
+        cluster_membership = u.argmax() + 1
+        u_tabel = u.toarray()
+    else:
+        cluster_membership = np.argmax(u, axis=0) + 1
+        u_tabel = u
 
     # DataFrame hasil cluster
     df_result = pd.DataFrame(
@@ -350,30 +1433,821 @@ def fcm_model(
 
     # Derajat keanggotaan
     for i in range(c):
-        df_result[f"Cluster {i+1}"] = np.round(u[i], 6)
-
+        df_result[f"Cluster {i+1}"] = np.round(u_tabel[i], 6)
+
+    if return_info:
+        terbaik = df_restart.loc[df_restart["Terbaik"]].iloc[0]
+        n_iter = int(terbaik["Iterasi"])
+        # Acuan iterasi adalah pelatihan terakhir tanpa warm start; bila warm
+        # start ditolak (mis. c berbeda) pelatihan ini sendiri menjadi acuan
+        if warm_used:
+            n_iter_cold = warm_start["n_iter_cold"]
+        else:
+            n_iter_cold = n_iter
+        info = {
+            "restarts": df_restart,
+            "centroids": cntr,
+            "u": u,
+            "n_iter": n_iter,
+            "n_iter_cold": n_iter_cold,
+            "iterations_saved": n_iter_cold - n_iter,
+            "stop_reason": terbaik["Berhenti"],
+            "trace": trace,
+        }
+        return df_evaluasi_cluster, df_result, info
     return df_evaluasi_cluster, df_result
 
 
+# ===================== SWEEP JUMLAH KLASTER =========================
+def _fit_sweep(
+    data,
+    c,
+    m,
+    error,
+    maxiter,
+    random_state,
+    columns_name,
+    window,
+    max_step,
+    top_k,
+    stop_rule,
+    accelerate,
+):
+    """
+    Satu kombinasi (c, m) untuk dijalankan di process pool. Indeks validitas
+    tidak dihitung di worker, lihat fcm_sweep.
+    Output:
+    - df_result, u, centroids
+    """
+    cache = make_cache(data, window=window, max_step=max_step, parallel=False)
+    _, df_result, info = fcm_model(
+        data,
+        c=c,
+        m=m,
+        error=error,
+        maxiter=maxiter,
+        columns_name=columns_name,
+        cache=cache,
+        random_state=random_state,
+        return_info=True,
+        progress=False,
+        window=window,
+        max_step=max_step,
+        top_k=top_k,
+        indices=(),
+        stop_rule=stop_rule,
+        accelerate=accelerate,
+    )
+    return df_result, info["u"], info["centroids"]
+
+
+def fcm_sweep(
+    data,
+    c_values=(2, 3, 4, 5),
+    m_values=(1.5,),
+    error=0.0001,
+    maxiter=100,
+    random_state=None,
+    n_jobs=None,
+    columns_name=komoditas,
+    window=None,
+    max_step=None,
+    top_k=None,
+    indices=INDEKS_DEFAULT,
+    stop_rule="objective",
+    accelerate=None,
+):
+    """
+    Melatih FCM untuk beberapa jumlah klaster (dan derajat fuzziness) secara
+    paralel pada process pool. Data cukup disiapkan sekali (prepare_data).
+
+    Parameters:
+    - data: array hasil prepare_data dengan shape(n_samples, n_features)
+    - c_values: daftar jumlah cluster
+    - m_values: daftar derajat fuzziness
+    - error, maxiter: lihat fcm_model
+    - random_state: seed yang sama untuk setiap kombinasi
+    - n_jobs: jumlah proses, None memakai jumlah CPU
+    - window, max_step: batasan DTW
+    - top_k: mode keanggotaan jarang, lihat fcm_with_dtw_model
+    - indices: indeks validitas, lihat validity.INDEKS; dihitung sekali
+      untuk semua kombinasi dengan evaluate_batch setelah pelatihan selesai
+    - stop_rule, accelerate: kriteria berhenti dan akselerasi, lihat fcm_model
+
+    Return/Output:
+    - df_evaluasi_cluster = DataFrame evaluasi seluruh kombinasi (c, m)
+    - keanggotaan = dict {(c, m): DataFrame keanggotaan klaster}
+    """
+    params = [(c, m) for m in m_values for c in c_values]
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(
+                _fit_sweep,
+                data,
+                c,
+                m,
+                error,
+                maxiter,
+                random_state,
+                columns_name,
+                window,
+                max_step,
+                top_k,
+                stop_rule,
+                accelerate,
+            )
+            for c, m in params
+        ]
+        results = [future.result() for future in futures]
+
+    # Jarak semua data ke semua centroid seluruh kombinasi dalam satu
+    # panggilan backend C
+    df_evaluasi_cluster = evaluate_batch(
+        data,
+        [(u, centroids) for _, u, centroids in results],
+        [m for _, m in params],
+        indices=indices,
+        window=window,
+        max_step=max_step,
+    )
+    df_evaluasi_cluster.insert(1, "m", [m for _, m in params])
+    keanggotaan = {
+        param: df_result for param, (df_result, _, _) in zip(params, results)
+    }
+    return df_evaluasi_cluster, keanggotaan
+
+
+# ===================== MINI-BATCH FCM =========================
+def kmeans_plus_plus(data, c, rng, window=None, max_step=None):
+    """
+    Memilih c series sebagai centroid awal dengan seeding k-means++: series
+    berikutnya dipilih dengan peluang sebanding kuadrat jarak DTW ke centroid
+    terdekat.
+    Output:
+    - centroids: array (c x t)
+    - n_dtw: jumlah perhitungan DTW
+    """
+    data = as_float_array(data)
+    pilihan = [int(rng.integers(len(data)))]
+    terdekat = np.full(len(data), np.inf)
+    for _ in range(c - 1):
+        dist = compute_distance_matrix(
+            data, data[pilihan[-1:]], window=window, max_step=max_step
+        )[0]
+        terdekat = np.minimum(terdekat, dist**2)
+        if terdekat.sum() > 0:
+            pilihan.append(int(rng.choice(len(data), p=terdekat / terdekat.sum())))
+        else:
+            pilihan.append(int(rng.integers(len(data))))
+    return data[pilihan].copy(), len(data) * (c - 1)
+
+
+def fcm_minibatch(
+    data,
+    c,
+    m,
+    error,
+    maxiter,
+    batch_size=256,
+    random_state=None,
+    progress=True,
+    return_info=False,
+    window=None,
+    max_step=None,
+    callback=None,
+):
+    """
+    Fuzzy C-Means mini-batch dengan jarak DTW untuk data berukuran besar
+    (misalnya ribuan series daerah x komoditas). Setiap iterasi hanya menghitung
+    DTW subset acak berukuran batch_size ke centroid, lalu centroid digeser ke
+    centroid batch dengan langkah yang menurun: bobot keanggotaan batch dibagi
+    akumulasi bobot cluster sejak awal (rata-rata berjalan). Centroid awal
+    diperoleh dari FCM penuh pada satu batch dengan seeding k-means++.
+    Keanggotaan seluruh data dihitung sekali di akhir, sehingga biaya DTW
+    adalah maxiter x batch_size x c ditambah n x c (linear terhadap n).
+    Parameter:
+    - data, c, m, maxiter: lihat fcm_model
+    - error: batas pergeseran centroid (RMS per titik waktu, maksimum antar
+      cluster) untuk berhenti
+    - batch_size: jumlah series per batch
+    - random_state: seed pemilihan batch dan inisiasi
+    - progress: tampilkan progress bar tqdm
+    - return_info: kembalikan juga dict info pelatihan
+    - window, max_step: batasan DTW
+    - callback: dipanggil setiap iterasi dengan dict catatan iterasi
+    Output:
+    - centroids, u (dan info berisi "objective", "n_iter", "stop_reason",
+      "n_dtw", "cache", dan "trace" bila return_info)
+
+    Catatan iterasi berisi "iteration", "t_membership" dan "t_centroid"
+    (detik), "n_dtw", "objective" (fungsi objektif batch yang diskalakan ke n
+    data), dan "shift" (pergeseran centroid).
+    """
+    data = as_float_array(data)
+    dtype = float_dtype(data)
+    n_sampels = len(data)
+    batch_size = min(batch_size, n_sampels)
+    rng = np.random.default_rng(random_state)
+
+    # Inisiasi: FCM penuh pada satu batch, dimulai dari centroid hasil
+    # seeding k-means++ agar centroid awal tidak berimpit
+    idx = rng.choice(n_sampels, batch_size, replace=False)
+    seeds, n_dtw = kmeans_plus_plus(data[idx], c, rng, window, max_step)
+    cache_awal = make_cache(data[idx], window=window, max_step=max_step)
+    centroids, _ = fcm_with_dtw_model(
+        data[idx],
+        c,
+        m,
+        error,
+        maxiter,
+        cache=cache_awal,
+        progress=False,
+        window=window,
+        max_step=max_step,
+        init_centroids=seeds,
+    )
+
+    bobot = np.zeros(c)
+    n_dtw += cache_awal.n_dtw
+    trace = []
+    stop_reason = "maxiter"
+    for iteration in progress_range(maxiter, progress):
+        idx = rng.choice(n_sampels, batch_size, replace=False)
+        batch = data[idx]
+
+        start = time.perf_counter()
+        dist = compute_distance_matrix(
+            batch, centroids, window=window, max_step=max_step
+        ).astype(dtype, copy=False)
+        u_batch = membership_from_distances(dist, m)
+        t_membership = time.perf_counter() - start
+
+        # Centroid bergeser ke centroid batch dengan langkah bobot batch /
+        # akumulasi bobot, sehingga langkah mengecil seiring iterasi
+        start = time.perf_counter()
+        weights = u_batch**m
+        bobot_batch = np.sum(weights, axis=1)
+        bobot += bobot_batch
+        centroid_batch = (weights @ batch) / bobot_batch[:, np.newaxis]
+        langkah = (bobot_batch / bobot).astype(dtype)[:, np.newaxis]
+        centroids_new = (1 - langkah) * centroids + langkah * centroid_batch
+        t_centroid = time.perf_counter() - start
+
+        shift = float(
+            np.max(np.sqrt(np.mean((centroids_new - centroids) ** 2, axis=1)))
+        )
+        centroids = centroids_new
+        n_dtw += dist.size
+
+        record = {
+            "iteration": iteration + 1,
+            "t_membership": t_membership,
+            "t_centroid": t_centroid,
+            "n_dtw": dist.size,
+            "objective": np.sum(weights * dist**2) * n_sampels / batch_size,
+            "shift": shift,
+        }
+        trace.append(record)
+        if callback is not None:
+            callback(record)
+
+        # Iterasi pertama selalu bergeser penuh ke centroid batch
+        if iteration > 0 and shift < error:
+            stop_reason = "tolerance"
+            break
+
+    # Satu kali perhitungan keanggotaan seluruh data
+    cache = make_cache(data, window=window, max_step=max_step)
+    u = update_membership_dtw(data, centroids, m, cache=cache)
+
+    if return_info:
+        info = {
+            "objective": compute_objective_function(u, centroids, data, m, cache),
+            "n_iter": iteration + 1,
+            "stop_reason": stop_reason,
+            "n_dtw": n_dtw + cache.n_dtw,
+            "cache": cache,
+            "trace": pd.DataFrame(trace),
+        }
+        return centroids, u, info
+    return centroids, u
+
+
+def adjusted_rand_index(labels_a, labels_b):
+    """
+    Adjusted Rand Index antara dua label klaster keras, tidak bergantung
+    pada urutan nomor klaster. Nilai 1 berarti partisi identik.
+    """
+    _, a = np.unique(labels_a, return_inverse=True)
+    _, b = np.unique(labels_b, return_inverse=True)
+    tabel = np.zeros((a.max() + 1, b.max() + 1))
+    np.add.at(tabel, (a, b), 1)
+
+    def pasangan(x):
+        return np.sum(x * (x - 1)) / 2
+
+    total = pasangan(tabel)
+    baris = pasangan(tabel.sum(axis=1))
+    kolom = pasangan(tabel.sum(axis=0))
+    harapan = baris * kolom / pasangan(np.array([len(a)]))
+    maksimum = (baris + kolom) / 2
+    if maksimum == harapan:
+        return 1.0
+    return float((total - harapan) / (maksimum - harapan))
+
+
+def minibatch_quality_gap(
+    data,
+    c,
+    m,
+    error=0.0001,
+    maxiter=100,
+    batch_size=256,
+    minibatch_error=0.001,
+    minibatch_maxiter=100,
+    random_state=None,
+    window=None,
+    max_step=None,
+):
+    """
+    Membandingkan FCM mini-batch dengan FCM penuh pada data yang sama.
+    Parameter:
+    - data, c, m, error, maxiter: parameter FCM penuh (lihat fcm_model)
+    - batch_size, minibatch_error, minibatch_maxiter: parameter fcm_minibatch
+    - random_state: seed kedua pelatihan
+    - window, max_step: batasan DTW
+    Output:
+    - df_gap: DataFrame fungsi objektif, MPC, PE, XB, waktu, dan jumlah DTW
+      kedua metode, dengan baris "Selisih" (mini-batch - penuh) dan kolom ARI
+      (kesamaan label keras terhadap FCM penuh)
+    """
+    hasil = []
+    labels = {}
+    for metode in ["Penuh", "Mini-batch"]:
+        start = time.perf_counter()
+        if metode == "Penuh":
+            cache = make_cache(data, window=window, max_step=max_step)
+            centroids, u, info = fcm_with_dtw_model(
+                data,
+                c,
+                m,
+                error,
+                maxiter,
+                cache=cache,
+                random_state=random_state,
+                progress=False,
+                return_info=True,
+                window=window,
+                max_step=max_step,
+            )
+        else:
+            centroids, u, info = fcm_minibatch(
+                data,
+                c,
+                m,
+                minibatch_error,
+                minibatch_maxiter,
+                batch_size=batch_size,
+                random_state=random_state,
+                progress=False,
+                return_info=True,
+                window=window,
+                max_step=max_step,
+            )
+            cache = info["cache"]
+        waktu = time.perf_counter() - start
+        n_dtw = cache.n_dtw if metode == "Penuh" else info["n_dtw"]
+
+        labels[metode] = np.argmax(u, axis=0)
+        hasil.append(
+            {
+                "Metode": metode,
+                "Fungsi Objektif": info["objective"],
+                "MPC": compute_mpc(u),
+                "PE": compute_pe(u),
+                "XB": compute_xb(
+                    data, centroids, u, m, cache=cache, window=window, max_step=max_step
+                ),
+                "Iterasi": info["n_iter"],
+                "Waktu (detik)": waktu,
+                "Jumlah DTW": n_dtw,
+                "ARI": adjusted_rand_index(labels["Penuh"], labels[metode]),
+            }
+        )
+
+    df_gap = pd.DataFrame(hasil)
+    selisih = df_gap.iloc[1].drop("Metode") - df_gap.iloc[0].drop("Metode")
+    df_gap.loc[len(df_gap)] = {"Metode": "Selisih", **selisih.to_dict()}
+    return df_gap
+
+
+# ===================== RUNNER BATCH =========================
+# Parameter satu run beserta nilai default (pipeline c=3, m=1.5 pada README)
+RUN_DEFAULTS = {
+    "source": "csv",
+    "freq": "W",
+    "anchor": None,
+    "dtype": "float64",
+    "c": 3,
+    "m": 1.5,
+    "error": 0.0001,
+    "maxiter": 100,
+    "seed": None,
+    "n_init": 1,
+    "window": None,
+    "max_step": None,
+    "top_k": None,
+    "stop_rule": "objective",
+    "accelerate": None,
+}
+# Kunci yang menentukan data input; data disiapkan sekali per kombinasi
+KUNCI_DATA = ("source", "freq", "anchor", "dtype")
+SOURCES = ("csv", "excel")
+DTYPES = ("float64", "float32")
+
+
+def load_config(path):
+    """
+    Membaca file konfigurasi runner (.json atau .toml). Kunci tingkat atas
+    adalah parameter bersama (lihat RUN_DEFAULTS) ditambah "jobs" dan
+    "output"; daftar "runs" berisi parameter set yang menimpa parameter
+    bersama.
+    """
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def check_run(run):
+    """
+    Memastikan nilai parameter satu run valid sebelum data disiapkan, sehingga
+    kesalahan konfigurasi dilaporkan sebagai ValueError.
+    """
+    pilihan = {
+        "source": SOURCES,
+        "dtype": DTYPES,
+        "stop_rule": STOP_RULES,
+        "accelerate": (None, *ACCELERATE),
+    }
+    for key, values in pilihan.items():
+        if run[key] not in values:
+            raise ValueError(
+                f"{key} harus salah satu dari {values}, bukan {run[key]!r}"
+            )
+
+    freq = run["freq"]
+    if not isinstance(freq, str):
+        raise ValueError(f"freq harus teks, bukan {freq!r}")
+    if freq not in KOLOM_PERIODE:
+        # Selain frekuensi bernama, hanya "<n>D" yang dikenal
+        _panjang_periode(freq)
+    if run["anchor"] is not None:
+        try:
+            pd.Timestamp(run["anchor"])
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"anchor bukan tanggal: {run['anchor']!r}") from exc
+
+    for key in ("seed", "top_k"):
+        if run[key] is not None and not isinstance(run[key], (int, np.integer)):
+            raise ValueError(f"{key} harus bilangan bulat, bukan {run[key]!r}")
+
+    # Prasyarat FCM: runner mengelompokkan series komoditas
+    if not 2 <= run["c"] <= len(komoditas):
+        raise ValueError(f"c harus antara 2 dan {len(komoditas)}, bukan {run['c']}")
+    if not run["m"] > 1:
+        raise ValueError(f"m harus lebih dari 1, bukan {run['m']}")
+
+
+def expand_runs(config, overrides=None):
+    """
+    Menyusun daftar parameter set dari konfigurasi. Prioritas nilai:
+    RUN_DEFAULTS < kunci tingkat atas config < overrides (flag CLI) < entri
+    "runs". Nilai c dan m boleh berupa list dan dikembangkan menjadi semua
+    kombinasinya.
+    Output:
+    - list dict parameter, masing-masing dengan kunci "name" yang unik
+
+    ValueError bila ada parameter yang tidak dikenal atau nilainya tidak
+    valid (lihat check_run).
+    """
+    config = dict(config)
+    entries = config.pop("runs", None) or [{}]
+    config.pop("jobs", None)
+    config.pop("output", None)
+
+    shared = dict(RUN_DEFAULTS)
+    for sumber in (config, overrides or {}):
+        for key, value in sumber.items():
+            if key not in RUN_DEFAULTS:
+                raise ValueError(f"Parameter tidak dikenal: {key}")
+            shared[key] = value
+
+    runs = []
+    names = set()
+    for entry in entries:
+        unknown = set(entry) - set(RUN_DEFAULTS) - {"name"}
+        if unknown:
+            raise ValueError(f"Parameter tidak dikenal: {sorted(unknown)}")
+        params = {**shared, **entry}
+        grid = [(c, m) for m in _as_list(params["m"]) for c in _as_list(params["c"])]
+        for c, m in grid:
+            run = {**params, "c": int(c), "m": float(m)}
+            check_run(run)
+            name = f"c{run['c']}_m{run['m']}"
+            if entry.get("name"):
+                name = entry["name"] if len(grid) == 1 else f"{entry['name']}_{name}"
+            base, i = name, 2
+            while name in names:
+                name = f"{base}_{i}"
+                i += 1
+            names.add(name)
+            run["name"] = name
+            runs.append(run)
+    return runs
+
+
+def _run_job(data, run):
+    """
+    Satu parameter set untuk dijalankan di process pool. Kegagalan
+    dikembalikan sebagai pesan sehingga run lain tetap berjalan.
+    """
+    try:
+        window = sakoe_chiba_window(run["window"], data.shape[1])
+        cache = make_cache(
+            data, window=window, max_step=run["max_step"], parallel=False
+        )
+        df_eval, df_result, info = fcm_model(
+            data,
+            c=run["c"],
+            m=run["m"],
+            error=run["error"],
+            maxiter=run["maxiter"],
+            cache=cache,
+            n_init=run["n_init"],
+            random_state=run["seed"],
+            n_jobs=1,
+            return_info=True,
+            progress=False,
+            window=window,
+            max_step=run["max_step"],
+            top_k=run["top_k"],
+            stop_rule=run["stop_rule"],
+            accelerate=run["accelerate"],
+        )
+        centroids = np.asarray(info["centroids"])
+        return {
+            "status": "ok",
+            "evaluasi": df_eval.iloc[0].to_dict(),
+            "keanggotaan": df_result,
+            "centroid": centroids,
+            "n_iter": info["n_iter"],
+            "stop_reason": info["stop_reason"],
+        }
+    except Exception as exc:
+        return {"status": "gagal", "pesan": f"{type(exc).__name__}: {exc}"}
+
+
+def run_batch(runs, output, n_jobs=None, columns_name=komoditas):
+    """
+    Menjalankan beberapa parameter set pada process pool dan menulis hasilnya
+    ke folder output:
+    - evaluasi.csv: satu baris per run (parameter, MPC/PE/XB, iterasi,
+      alasan berhenti, status, dan pesan kegagalan)
+    - keanggotaan_<run>.csv: derajat keanggotaan dan defuzzifikasi
+    - centroid_<run>.csv: centroid setiap klaster per periode
+    Parameter:
+    - runs: list parameter set hasil expand_runs
+    - output: folder output
+    - n_jobs: jumlah proses, None memakai jumlah CPU
+    Output:
+    - df_evaluasi: DataFrame isi evaluasi.csv
+    """
+    os.makedirs(output, exist_ok=True)
+
+    # Data disiapkan sekali untuk setiap kombinasi sumber/periode/dtype. Bila
+    # gagal (mis. store Excel belum dibuat), semua run dengan data tersebut
+    # dicatat gagal dan run lain tetap berjalan.
+    datasets = {}
+    for run in runs:
+        key = tuple(run[k] for k in KUNCI_DATA)
+        if key not in datasets:
+            try:
+                datasets[key] = prepare_data(
+                    load_data(source=run["source"]),
+                    freq=run["freq"],
+                    anchor=run["anchor"],
+                    dtype=run["dtype"],
+                )
+            except Exception as exc:
+                datasets[key] = {
+                    "status": "gagal",
+                    "pesan": f"{type(exc).__name__}: {exc}",
+                }
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = []
+        for run in runs:
+            data = datasets[tuple(run[k] for k in KUNCI_DATA)]
+            if isinstance(data, dict):
+                futures.append(data)
+            else:
+                futures.append(executor.submit(_run_job, data, run))
+        results = []
+        for future in futures:
+            if isinstance(future, dict):
+                results.append(future)
+                continue
+            try:
+                results.append(future.result())
+            except Exception as exc:  # proses worker berhenti tiba-tiba
+                results.append(
+                    {"status": "gagal", "pesan": f"{type(exc).__name__}: {exc}"}
+                )
+
+    rows = []
+    for run, hasil in zip(runs, results):
+        row = {"Run": run["name"]}
+        row.update({key: run[key] for key in RUN_DEFAULTS})
+        if hasil["status"] == "ok":
+            row.update({k: hasil["evaluasi"][k] for k in ("MPC", "PE", "XB")})
+            row.update({"Iterasi": hasil["n_iter"], "Berhenti": hasil["stop_reason"]})
+            hasil["keanggotaan"].to_csv(
+                os.path.join(output, f"keanggotaan_{run['name']}.csv"), index=False
+            )
+            df_centroid = pd.DataFrame(
+                hasil["centroid"],
+                columns=np.arange(1, hasil["centroid"].shape[1] + 1),
+            )
+            df_centroid.insert(
+                0, "Cluster", [f"Cluster {i + 1}" for i in range(len(df_centroid))]
+            )
+            df_centroid.to_csv(
+                os.path.join(output, f"centroid_{run['name']}.csv"), index=False
+            )
+        row.update({"Status": hasil["status"], "Pesan": hasil.get("pesan")})
+        rows.append(row)
+
+    kolom = ["Run", *RUN_DEFAULTS, "MPC", "PE", "XB", "Iterasi", "Berhenti"]
+    df_evaluasi = pd.DataFrame(rows, columns=kolom + ["Status", "Pesan"])
+    # Kolom bilangan bulat yang boleh kosong tidak dibaca ulang sebagai float
+    for kolom_int in ("seed", "top_k", "Iterasi"):
+        df_evaluasi[kolom_int] = df_evaluasi[kolom_int].astype("Int64")
+    df_evaluasi.to_csv(os.path.join(output, "evaluasi.csv"), index=False)
+    return df_evaluasi
+
+
 # ==================== IMPLEMENTASI METHOD ==========
-print("Model has been complete")
-# data = load_data()
-
-# Mengubah ke data mingguan
-# data_mingguan = day_to_week(data)
-
-# Normalisasi data
-# data_scaled = z_normalization(data_mingguan)
-
-# Transpose data
-# data_for_fcm = transpose_time_series_data(data_scaled)
-
-# Implementasi model
-# df_evaluasi_cluster, df_derajat_keanggotaan = fcm_model(
-#     data_for_fcm, c=3, m=1.5, error=0.0001, maxiter=100
-# )
-# print("Model Selesai")
-# print("Evaluasi klaster:")
-# print(df_evaluasi_cluster)
-# print("\nDerajat Keanggotaan dan Defuzzifikasi")
-# print(df_derajat_keanggotaan)
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Model FCM dengan jarak DTW")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run = subparsers.add_parser(
+        "run",
+        help="Pipeline FCM untuk satu atau beberapa parameter set (default)",
+    )
+    run.add_argument("--config", default=None, help="File konfigurasi .json/.toml")
+    run.add_argument("--c", type=int, nargs="+", default=None)
+    run.add_argument("--m", type=float, nargs="+", default=None)
+    run.add_argument("--error", type=float, default=None)
+    run.add_argument("--maxiter", type=int, default=None)
+    run.add_argument("--seed", type=int, default=None)
+    run.add_argument("--n-init", type=int, default=None)
+    run.add_argument(
+        "--window", type=float, default=None, help="Pita Sakoe-Chiba (persen)"
+    )
+    run.add_argument("--max-step", type=float, default=None)
+    run.add_argument("--top-k", type=int, default=None)
+    run.add_argument("--stop-rule", choices=STOP_RULES, default=None)
+    run.add_argument("--accelerate", choices=ACCELERATE, default=None)
+    run.add_argument("--source", choices=SOURCES, default=None)
+    run.add_argument("--freq", default=None, help="D, W, 2W, M, atau <n>D")
+    run.add_argument("--anchor", default=None, help="Awal periode ke-2")
+    run.add_argument("--dtype", choices=DTYPES, default=None)
+    run.add_argument("--jobs", type=int, default=None)
+    run.add_argument("--output", default=None, help="Folder output (default hasil)")
+
+    sweep = subparsers.add_parser(
+        "sweep", help="Evaluasi MPC/PE/XB untuk beberapa jumlah klaster"
+    )
+    sweep.add_argument("--c", type=int, nargs="+", default=[2, 3, 4, 5])
+    sweep.add_argument("--m", type=float, nargs="+", default=[1.5])
+    sweep.add_argument("--error", type=float, default=0.0001)
+    sweep.add_argument("--maxiter", type=int, default=100)
+    sweep.add_argument("--seed", type=int, default=None)
+    sweep.add_argument("--jobs", type=int, default=None)
+    sweep.add_argument(
+        "--window", type=float, default=None, help="Pita Sakoe-Chiba (persen)"
+    )
+    sweep.add_argument("--max-step", type=float, default=None)
+    sweep.add_argument(
+        "--top-k", type=int, default=None, help="Mode keanggotaan jarang top-k"
+    )
+    sweep.add_argument(
+        "--freq", default="W", help="Periode agregasi: D, W, 2W, M, atau <n>D"
+    )
+    sweep.add_argument("--anchor", default=None, help="Awal periode ke-2")
+    sweep.add_argument(
+        "--dtype",
+        choices=DTYPES,
+        default="float64",
+        help="float32 untuk mode ringkas",
+    )
+    sweep.add_argument(
+        "--stop-rule",
+        choices=STOP_RULES,
+        default="objective",
+        help="Kriteria berhenti dengan ambang --error",
+    )
+    sweep.add_argument(
+        "--accelerate",
+        choices=ACCELERATE,
+        default=None,
+        help="Akselerasi update keanggotaan",
+    )
+    sweep.add_argument(
+        "--indices",
+        nargs="+",
+        choices=list(INDEKS),
+        default=list(INDEKS_DEFAULT),
+        help="Indeks validitas yang dilaporkan",
+    )
+    sweep.add_argument("--output", default=None, help="Folder output CSV")
+
+    args = parser.parse_args(argv)
+
+    if args.command in (None, "run"):
+        if args.command is None:  # tanpa subcommand: pipeline default
+            args = run.parse_args([])
+        try:
+            config = load_config(args.config) if args.config else {}
+            overrides = {
+                key: value
+                for key, value in vars(args).items()
+                if key in RUN_DEFAULTS and value is not None
+            }
+            runs = expand_runs(config, overrides)
+        except (OSError, ValueError) as exc:
+            print(f"Konfigurasi tidak valid: {exc}", file=sys.stderr)
+            return 2
+
+        output = args.output or config.get("output") or "hasil"
+        n_jobs = args.jobs or config.get("jobs")
+        df_evaluasi = run_batch(runs, output, n_jobs=n_jobs)
+        with pd.option_context("display.width", 160):
+            print(df_evaluasi.drop(columns=list(KUNCI_DATA)).to_string(index=False))
+        gagal = df_evaluasi[df_evaluasi["Status"] != "ok"]
+        if len(gagal):
+            print(f"{len(gagal)} dari {len(runs)} run gagal", file=sys.stderr)
+            return 1
+        print(f"Model has been complete, hasil disimpan di {output}")
+        return 0
+
+    if args.command == "sweep":
+        data_for_fcm = prepare_data(
+            load_data(), freq=args.freq, anchor=args.anchor, dtype=args.dtype
+        )
+        df_evaluasi_cluster, keanggotaan = fcm_sweep(
+            data_for_fcm,
+            c_values=args.c,
+            m_values=args.m,
+            error=args.error,
+            maxiter=args.maxiter,
+            random_state=args.seed,
+            n_jobs=args.jobs,
+            window=sakoe_chiba_window(args.window, data_for_fcm.shape[1]),
+            max_step=args.max_step,
+            top_k=args.top_k,
+            indices=args.indices,
+            stop_rule=args.stop_rule,
+            accelerate=args.accelerate,
+        )
+        print("Evaluasi klaster:")
+        print(df_evaluasi_cluster)
+
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+            df_evaluasi_cluster.to_csv(
+                os.path.join(args.output, "evaluasi_cluster.csv"), index=False
+            )
+            for (c, m), df_result in keanggotaan.items():
+                df_result.to_csv(
+                    os.path.join(args.output, f"keanggotaan_c{c}_m{m}.csv"),
+                    index=False,
+                )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
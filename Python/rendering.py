@@ -0,0 +1,114 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Batas titik per series yang dikirim ke browser
+MAX_POINTS = 1000
+
+
+def lttb(x, y, n_out):
+    """
+    Downsampling Largest-Triangle-Three-Buckets: memilih n_out titik yang
+    mempertahankan bentuk visual series (puncak dan lembah tetap terlihat).
+    Titik pertama dan terakhir selalu dipilih.
+    Parameter:
+    - x, y: koordinat numerik series (panjang n)
+    - n_out: jumlah titik hasil
+    Output:
+    - idx: indeks titik terpilih (terurut)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Batas bucket untuk n_out - 2 titik tengah
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    edges = np.append(edges, n)
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Rata-rata bucket berikutnya sebagai titik ketiga segitiga
+        next_lo, next_hi = edges[i + 1], edges[i + 2]
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def _numeric(x):
+    """Koordinat x numerik untuk perhitungan LTTB (tanggal -> nanodetik)"""
+    if x.dtype.kind == "M":
+        return x.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def line_traces(df, x, columns, max_points=MAX_POINTS):
+    """
+    Trace garis WebGL (Scattergl) untuk setiap kolom DataFrame. Series yang
+    lebih panjang dari max_points di-downsample dengan LTTB di server.
+    Kolom dibaca langsung sebagai array, tanpa format panjang (melt) dan
+    filter per komoditas.
+    Parameter:
+    - df: DataFrame format lebar (satu kolom per series)
+    - x: nama kolom sumbu x
+    - columns: kolom yang digambar
+    - max_points: batas titik per series, None berarti tanpa downsampling
+    Output:
+    - traces: list go.Scattergl
+    """
+    x_values = df[x].to_numpy()
+    x_numeric = _numeric(df[x])
+
+    traces = []
+    for col in columns:
+        y_values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = np.flatnonzero(~np.isnan(y_values))
+        if max_points is not None and len(valid) > max_points:
+            valid = valid[lttb(x_numeric[valid], y_values[valid], max_points)]
+        traces.append(
+            go.Scattergl(x=x_values[valid], y=y_values[valid], mode="lines", name=col)
+        )
+    return traces
+
+
+def alignment_trace(s1, s2, path, max_lines=None, **line):
+    """
+    Garis penghubung alignment DTW sebagai satu trace: setiap pasangan
+    (a, b) pada path menjadi segmen [a, b] dipisahkan None.
+    Parameter:
+    - s1, s2: series yang disejajarkan
+    - path: best path DTW (L x 2)
+    - max_lines: batas jumlah garis (diambil merata), None berarti semua
+    - line: atribut garis plotly (color, width, dash)
+    Output:
+    - trace: go.Scattergl
+    """
+    path = np.asarray(path)
+    if max_lines is not None and len(path) > max_lines:
+        path = path[:: int(np.ceil(len(path) / max_lines))]
+    a, b = path[:, 0], path[:, 1]
+    s1 = np.asarray(s1, dtype=np.float64)
+    s2 = np.asarray(s2, dtype=np.float64)
+
+    # Segmen [a, b] dan pemisah NaN: (L x 3) diratakan
+    xs = np.column_stack([a, b, np.full(len(a), np.nan)]).ravel()
+    ys = np.column_stack([s1[a], s2[b], np.full(len(a), np.nan)]).ravel()
+    return go.Scattergl(
+        x=xs,
+        y=ys,
+        mode="lines",
+        line=line,
+        connectgaps=False,
+        hoverinfo="skip",
+        showlegend=False,
+    )
@@ -0,0 +1,100 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def _nbytes(value):
+    """Perkiraan ukuran memori sebuah hasil (DataFrame, array, atau tuple)"""
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Cache LRU untuk hasil model dengan batas memori. Entri yang paling lama
+    tidak dipakai dikeluarkan lebih dulu bila total ukuran melebihi batas.
+    Parameter:
+    - max_bytes: batas total ukuran hasil yang disimpan
+    - max_entries: batas jumlah entri (opsional)
+    Atribut:
+    - hits, misses, evictions: statistik pemakaian cache
+    """
+
+    def __init__(self, max_bytes=64 * 1024**2, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Mengambil hasil dan menandainya sebagai yang terakhir dipakai"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        """Menyimpan hasil; hasil yang lebih besar dari batas tidak disimpan"""
+        nbytes = _nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def get_or_compute(self, key, compute):
+        """Mengambil hasil dari cache, atau menghitung dan menyimpannya"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _evict(self):
+        while self._entries and (
+            self._nbytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        """Ringkasan penggunaan cache"""
+        return {
+            "entries": len(self._entries),
+            "nbytes": self._nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from dtaidistance import dtw
+
+from model import komoditas
+
+# ===================== INDEKS JENDELA =========================
+
+
+def _znormal_rows(windows):
+    """Standarisasi setiap baris (jendela) secara terpisah"""
+    mean = windows.mean(axis=1, keepdims=True)
+    std = windows.std(axis=1, keepdims=True)
+    std[std == 0] = 1.0
+    return (windows - mean) / std
+
+
+def _envelope(windows, radius):
+    """
+    Envelope atas dan bawah (LB_Keogh) setiap jendela dengan radius Sakoe-Chiba.
+    """
+    panjang = windows.shape[1]
+    if radius >= panjang - 1:
+        upper = np.repeat(windows.max(axis=1, keepdims=True), panjang, axis=1)
+        lower = np.repeat(windows.min(axis=1, keepdims=True), panjang, axis=1)
+        return upper, lower
+
+    pad = ((0, 0), (radius, radius))
+    upper = sliding_window_view(
+        np.pad(windows, pad, constant_values=-np.inf), 2 * radius + 1, axis=1
+    ).max(axis=2)
+    lower = sliding_window_view(
+        np.pad(windows, pad, constant_values=np.inf), 2 * radius + 1, axis=1
+    ).min(axis=2)
+    return upper, lower
+
+
+def build_window_index(
+    data_mingguan, panjang, window=None, col=komoditas, normalize=True
+):
+    """
+    Membangun indeks semua jendela geser sepanjang `panjang` minggu dari setiap
+    komoditas beserta envelope LB_Keogh dan titik awal/akhir untuk LB_Kim.
+    Parameter:
+    - data_mingguan: DataFrame hasil day_to_week (atau z_normalization)
+    - panjang: panjang jendela (minggu)
+    - window: jendela Sakoe-Chiba DTW (sama dengan parameter dtaidistance),
+      None berarti tanpa batas
+    - col: kolom komoditas yang diindeks
+    - normalize: standarisasi-z setiap jendela agar yang dibandingkan pola
+    Output:
+    - index: dict berisi jendela, envelope, dan lokasi setiap jendela
+    """
+    windows = []
+    nama = []
+    minggu_awal = []
+    minggu = data_mingguan["Minggu ke"].to_numpy(dtype=np.int64)
+
+    for kolom in col:
+        series = data_mingguan[kolom].to_numpy(dtype=np.float64)
+        w = sliding_window_view(series, panjang)
+        valid = ~np.isnan(w).any(axis=1)
+        windows.append(w[valid])
+        nama.extend([kolom] * int(valid.sum()))
+        minggu_awal.append(minggu[: len(w)][valid])
+
+    windows = np.vstack(windows)
+    if normalize:
+        windows = _znormal_rows(windows)
+
+    radius = panjang - 1 if window is None else max(window - 1, 0)
+    upper, lower = _envelope(windows, radius)
+
+    return {
+        "windows": np.ascontiguousarray(windows),
+        "upper": upper,
+        "lower": lower,
+        "komoditas": np.array(nama),
+        "minggu_awal": np.concatenate(minggu_awal),
+        "panjang": panjang,
+        "window": window,
+        "normalize": normalize,
+    }
+
+
+# ===================== PENCARIAN =========================
+
+
+def lower_bounds(index, query):
+    """
+    Batas bawah jarak DTW query ke semua jendela: max(LB_Kim, LB_Keogh).
+    """
+    windows = index["windows"]
+
+    # LB_Kim: titik pertama dan terakhir selalu sejajar pada DTW
+    lb_kim = np.sqrt(
+        (windows[:, 0] - query[0]) ** 2 + (windows[:, -1] - query[-1]) ** 2
+    )
+
+    # LB_Keogh: selisih query terhadap envelope jendela
+    diff = np.where(
+        query > index["upper"],
+        query - index["upper"],
+        np.where(query < index["lower"], index["lower"] - query, 0.0),
+    )
+    lb_keogh = np.sqrt(np.sum(diff**2, axis=1))
+    return np.maximum(lb_kim, lb_keogh)
+
+
+def search_similar(index, query, k=5, exclude=None):
+    """
+    Mencari k jendela paling mirip dengan query berdasarkan jarak DTW.
+    Kandidat diurutkan berdasarkan batas bawah; kandidat dengan batas bawah di
+    atas jarak ke-k saat ini tidak dihitung, dan DTW dihentikan lebih awal
+    (early abandoning) bila melewati jarak ke-k.
+    Jendela dari komoditas yang sama yang saling tumpang tindih hanya
+    diwakili oleh yang terdekat.
+    Parameter:
+    - index: hasil build_window_index
+    - query: array sepanjang index["panjang"]
+    - k: jumlah hasil
+    - exclude: (komoditas, minggu_awal) yang dikecualikan beserta jendela
+      yang tumpang tindih dengannya, misalnya periode query itu sendiri
+    Output:
+    - df_hasil: DataFrame komoditas, minggu awal, minggu akhir, dan jarak DTW
+    - stats: jumlah kandidat, yang dipangkas batas bawah, yang dihentikan
+      lebih awal, dan yang dihitung penuh
+    """
+    panjang = index["panjang"]
+    query = np.asarray(query, dtype=np.float64)
+    if len(query) != panjang:
+        raise ValueError(f"Panjang query harus {panjang}, bukan {len(query)}")
+    if index["normalize"]:
+        query = _znormal_rows(query[np.newaxis, :])[0]
+
+    nama = index["komoditas"]
+    awal = index["minggu_awal"]
+
+    kandidat = np.ones(len(nama), dtype=bool)
+    if exclude is not None:
+        kandidat &= ~((nama == exclude[0]) & (np.abs(awal - exclude[1]) < panjang))
+
+    lb = lower_bounds(index, query)
+    urutan = np.argsort(lb)
+    urutan = urutan[kandidat[urutan]]
+
+    terbaik = []  # list (jarak, indeks jendela)
+    stats = {
+        "kandidat": len(urutan),
+        "dipangkas_lb": 0,
+        "dihentikan": 0,
+        "dtw_penuh": 0,
+    }
+    for pos, idx in enumerate(urutan):
+        batas = terbaik[-1][0] if len(terbaik) == k else np.inf
+        if lb[idx] >= batas:
+            stats["dipangkas_lb"] = len(urutan) - pos
+            break
+
+        jarak = dtw.distance_fast(
+            query,
+            index["windows"][idx],
+            window=index["window"],
+            max_dist=None if np.isinf(batas) else batas,
+        )
+        if np.isinf(jarak):
+            stats["dihentikan"] += 1
+            continue
+        stats["dtw_penuh"] += 1
+
+        # Jendela tumpang tindih pada komoditas yang sama: simpan yang terdekat
+        tumpang = [
+            j
+            for j, (_, lain) in enumerate(terbaik)
+            if nama[lain] == nama[idx] and abs(awal[lain] - awal[idx]) < panjang
+        ]
+        if any(terbaik[j][0] <= jarak for j in tumpang):
+            continue
+        terbaik = [t for j, t in enumerate(terbaik) if j not in tumpang]
+        terbaik.append((jarak, idx))
+        terbaik.sort(key=lambda t: t[0])
+        terbaik = terbaik[:k]
+
+    df_hasil = pd.DataFrame(
+        {
+            "Komoditas": [nama[idx] for _, idx in terbaik],
+            "Minggu awal": [awal[idx] for _, idx in terbaik],
+            "Minggu akhir": [awal[idx] + panjang - 1 for _, idx in terbaik],
+            "Jarak DTW": [jarak for jarak, _ in terbaik],
+        }
+    )
+    return df_hasil, stats
+
+
+def similar_periods(data_mingguan, nama, panjang, k=5, window=None, index=None):
+    """
+    Mencari periode historis yang paling mirip dengan `panjang` minggu terakhir
+    dari satu komoditas, di seluruh komoditas.
+    Parameter:
+    - data_mingguan: DataFrame hasil day_to_week
+    - nama: nama komoditas query, misalnya "Cabai Rawit"
+    - panjang: jumlah minggu terakhir yang dijadikan query
+    - k: jumlah hasil
+    - window: jendela Sakoe-Chiba DTW
+    - index: indeks dari build_window_index untuk dipakai ulang antar query
+    Output:
+    - df_hasil, stats: lihat search_similar
+    """
+    if index is None:
+        index = build_window_index(data_mingguan, panjang, window=window)
+
+    query = data_mingguan[nama].to_numpy(dtype=np.float64)[-panjang:]
+    minggu_awal = data_mingguan["Minggu ke"].to_numpy(dtype=np.int64)[-panjang]
+    return search_similar(index, query, k=k, exclude=(nama, minggu_awal))
@@ -0,0 +1,170 @@
+import numpy as np
+
+# Indeks yang dilaporkan fcm_model secara default
+INDEKS_DEFAULT = ("MPC", "PE", "XB")
+
+
+# ===================== INDEKS BERBASIS KEANGGOTAAN =========================
+# u dapat berupa matriks keanggotaan penuh (c x n) atau nilai keanggotaan
+# bentuk jarang (k x n); keanggotaan nol tidak menambah jumlah.
+
+
+def partition_coefficient(u):
+    """
+    Partition Coefficient (PC) atau Fuzzy Partition Coefficient (FPC)
+    Nilai ideal: mendekati 1
+    """
+    n = u.shape[1]  # jumlah data
+    return np.sum(u**2, dtype=np.float64) / n
+
+
+def modified_partition_coefficient(u, c):
+    """
+    Modified Partition Coefficient (MPC)
+    Nilai ideal: mendekati 1, maksimal = 1
+    """
+    return 1 - (c / (c - 1)) * (1 - partition_coefficient(u))
+
+
+def partition_entropy(u):
+    """
+    Partition Entropy (PE)
+    Nilai ideal: mendekati 0 (semakin jelas)
+    """
+    n = u.shape[1]  # jumlah data
+    return -np.sum(u * np.log(u + 1e-10), dtype=np.float64) / n
+
+
+# ===================== INDEKS BERBASIS JARAK =========================
+# dist adalah jarak DTW data ke centroid dengan bentuk yang sama seperti u,
+# dist_centroid adalah matriks jarak antar centroid (c x c).
+
+
+def _pasangan_centroid(dist_centroid):
+    """Jarak semua pasangan centroid berbeda (segitiga atas)"""
+    c = len(dist_centroid)
+    return dist_centroid[np.triu_indices(c, k=1)].astype(np.float64)
+
+
+def compactness_terms(u, dist, m):
+    """
+    u^m * d^2 setiap pasangan data-centroid. Pasangan yang tidak terjangkau
+    DTW (d = inf karena max_step) berkeanggotaan nol dan bernilai 0, bukan NaN.
+    """
+    with np.errstate(invalid="ignore"):
+        suku = (u**m) * (dist**2)
+    if not np.all(np.isfinite(dist)):
+        suku = np.where(u > 0, suku, 0)
+    return suku
+
+
+def _kompak(u, dist, m):
+    """Jumlah u^m * d^2 seluruh pasangan data-centroid (akumulator float64)"""
+    return np.sum(compactness_terms(u, dist, m), dtype=np.float64)
+
+
+def xie_beni(u, dist, dist_centroid, m):
+    """
+    Xie-Beni Index (XB): kekompakan dibagi n x jarak minimum antar centroid.
+    Nilai ideal: semakin kecil semakin baik
+    """
+    n = u.shape[1]
+    min_dist = np.min(_pasangan_centroid(dist_centroid))
+    return _kompak(u, dist, m) / (n * min_dist**2)
+
+
+def tang_index(u, dist, dist_centroid, m):
+    """
+    Tang Index (TI): seperti XB dengan penalti rata-rata jarak antar centroid
+    sehingga tetap stabil saat dua centroid berdekatan atau c besar.
+    Nilai ideal: semakin kecil semakin baik
+    """
+    c = len(dist_centroid)
+    pasangan = _pasangan_centroid(dist_centroid) ** 2
+    # Jumlah seluruh pasangan terurut j != k adalah dua kali segitiga atas
+    penalti = 2 * np.sum(pasangan) / (c * (c - 1))
+    return (_kompak(u, dist, m) + penalti) / (np.min(pasangan) + 1 / c)
+
+
+def partition_index(u, dist, dist_centroid, m, index=None):
+    """
+    Partition Index (SC, Bensaid dkk.): jumlah rasio kekompakan setiap
+    klaster terhadap ukuran fuzzy klaster dan jarak ke centroid lain.
+    Nilai ideal: semakin kecil semakin baik
+    Parameter:
+    - index: indeks centroid (k x n) bila u dan dist berbentuk jarang
+    """
+    c = len(dist_centroid)
+    kompak = compactness_terms(u, dist, m).astype(np.float64)
+    if index is None:
+        kompak = kompak.sum(axis=1)
+        ukuran = u.sum(axis=1)
+    else:
+        kompak = np.bincount(index.ravel(), weights=kompak.ravel(), minlength=c)
+        ukuran = np.bincount(index.ravel(), weights=u.ravel(), minlength=c)
+    separasi = np.sum(dist_centroid.astype(np.float64) ** 2, axis=0)
+    return np.sum(kompak / (ukuran * separasi))
+
+
+# ===================== EVALUASI =========================
+
+# Nama indeks -> (fungsi, butuh jarak)
+INDEKS = {
+    "PC": (partition_coefficient, False),
+    "MPC": (modified_partition_coefficient, False),
+    "PE": (partition_entropy, False),
+    "XB": (xie_beni, True),
+    "TI": (tang_index, True),
+    "SC": (partition_index, True),
+}
+
+
+def check_indices(names):
+    """Memastikan semua nama indeks dikenal"""
+    unknown = [name for name in names if name not in INDEKS]
+    if unknown:
+        raise ValueError(f"Indeks tidak dikenal: {unknown}, pilihan: {list(INDEKS)}")
+    return names
+
+
+def needs_distance(names):
+    """True bila salah satu indeks membutuhkan matriks jarak"""
+    return any(INDEKS[name][1] for name in check_indices(names))
+
+
+def compute_indices(
+    u, m, c=None, dist=None, dist_centroid=None, index=None, names=INDEKS_DEFAULT
+):
+    """
+    Menghitung beberapa indeks validitas sekaligus dari keanggotaan dan
+    matriks jarak yang sudah dihitung.
+    Parameter:
+    - u: matriks keanggotaan (c x n) atau nilai keanggotaan jarang (k x n)
+    - m: derajat fuzziness
+    - c: jumlah cluster (default u.shape[0])
+    - dist: jarak DTW data ke centroid, bentuk sama seperti u
+    - dist_centroid: matriks jarak antar centroid (c x c)
+    - index: indeks centroid (k x n) untuk keanggotaan jarang
+    - names: nama indeks, lihat INDEKS
+    Output:
+    - dict nama indeks -> nilai
+    """
+    c = u.shape[0] if c is None else c
+    if needs_distance(names) and (dist is None or dist_centroid is None):
+        raise ValueError(
+            "dist dan dist_centroid diperlukan untuk indeks berbasis jarak"
+        )
+
+    hasil = {}
+    for name in names:
+        func, jarak = INDEKS[name]
+        if name == "MPC":
+            nilai = func(u, c)
+        elif name == "SC":
+            nilai = func(u, dist, dist_centroid, m, index=index)
+        elif jarak:
+            nilai = func(u, dist, dist_centroid, m)
+        else:
+            nilai = func(u)
+        hasil[name] = float(nilai)
+    return hasil
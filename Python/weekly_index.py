@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from model import komoditas, z_normalization, period_number
+
+
+class WeeklyPrefixIndex:
+    """
+    Indeks prefix-sum harga harian untuk membentuk data mingguan pada rentang
+    tanggal mana pun tanpa mengelompokkan ulang data harian. Jumlah dan
+    banyaknya harga positif per kolom disimpan secara kumulatif sekali, lalu
+    rata-rata mingguan suatu rentang diperoleh dari selisih prefix di batas
+    minggu (O(jumlah minggu)). Hasilnya sama dengan day_to_week pada data
+    harian yang difilter ke rentang tersebut.
+    Parameter:
+    - data: DataFrame harian dengan kolom "Tanggal" (hasil load_data)
+    - col: kolom komoditas
+    """
+
+    def __init__(self, data, col=komoditas):
+        self.col = list(col)
+        daily = data.sort_values(by="Tanggal").reset_index(drop=True)
+        self.dates = daily["Tanggal"].to_numpy(dtype="datetime64[ns]")
+
+        values = daily[self.col].to_numpy(dtype=np.float64)
+        positive = values > 0  # NaN dan harga <= 0 diabaikan seperti day_to_week
+        zero = np.zeros((1, len(self.col)))
+        self.cum_sum = np.vstack(
+            [zero, np.cumsum(np.where(positive, values, 0), axis=0)]
+        )
+        self.cum_count = np.vstack([zero, np.cumsum(positive, axis=0)])
+
+        # Posisi awal setiap minggu pada data harian
+        week = period_number(daily["Tanggal"], freq="W")
+        self.week_start = np.flatnonzero(np.diff(week, prepend=week[0] - 1))
+        self.weeks = week[self.week_start]
+
+    def _bounds(self, start, end):
+        """Posisi baris harian [lo, hi) untuk rentang tanggal start..end"""
+        lo, hi = 0, len(self.dates)
+        if start is not None:
+            start = np.datetime64(pd.Timestamp(start), "ns")
+            lo = np.searchsorted(self.dates, start, "left")
+        if end is not None:
+            end = np.datetime64(pd.Timestamp(end), "ns")
+            hi = np.searchsorted(self.dates, end, "right")
+        return lo, hi
+
+    def weekly_raw(self, start=None, end=None):
+        """
+        Rata-rata mingguan rentang start..end (inklusif) sebelum interpolasi.
+        """
+        lo, hi = self._bounds(start, end)
+        if hi <= lo:
+            return pd.DataFrame(columns=["Minggu ke"] + self.col)
+
+        first = np.searchsorted(self.week_start, lo, "right") - 1
+        last = np.searchsorted(self.week_start, hi - 1, "right") - 1
+        batas = np.append(self.week_start[first + 1 : last + 1], hi)
+        batas = np.insert(batas, 0, lo)
+
+        total = self.cum_sum[batas[1:]] - self.cum_sum[batas[:-1]]
+        count = self.cum_count[batas[1:]] - self.cum_count[batas[:-1]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+
+        df = pd.DataFrame(mean, columns=self.col)
+        df.insert(0, "Minggu ke", pd.array(self.weeks[first : last + 1], dtype="Int64"))
+        return df
+
+    def weekly(self, start=None, end=None):
+        """Data mingguan rentang start..end, sama dengan day_to_week"""
+        df = self.weekly_raw(start, end)
+        df[self.col] = df[self.col].interpolate(method="linear")
+        return df
+
+    def weekly_norm(self, start=None, end=None):
+        """Data mingguan ternormalisasi rentang start..end"""
+        return z_normalization(self.weekly(start, end), col=self.col)